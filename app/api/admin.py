@@ -0,0 +1,42 @@
+import os
+from fastapi import APIRouter, Depends, Query
+from app.config import redis_pool_status
+from app.db.instrumentation import pool_status
+from app.db.sharding import shard_engines, shard_router
+from app.db.slow_queries import SLOW_QUERY_THRESHOLD_MS, slow_query_log
+from app.middleware.admission import controllers
+from app.middleware.auth import require_admin
+from app.middleware.tenant_scheduler import tenant_schedulers
+from app.services.autocomplete import autocomplete_cache
+from app.services.warmup import warmup_state
+
+router = APIRouter(prefix="/admin", dependencies=[Depends(require_admin)])
+
+
+@router.get("/debug/state")
+async def debug_state():
+    """Dump current pool, cache and scheduler state for troubleshooting.
+
+    State is per process; with several workers, ``pid`` says which one answered.
+    """
+    return {
+        "pid": os.getpid(),
+        "ready": warmup_state.ready,
+        "warmup_errors": warmup_state.errors,
+        "db_pools": {name: pool_status(shard_engine) for name, shard_engine in shard_engines.items()},
+        "shards": shard_router.snapshot(),
+        "redis": redis_pool_status(),
+        "admission": {route: controller.snapshot() for route, controller in controllers.items()},
+        "tenant_schedulers": {shard: scheduler.snapshot() for shard, scheduler in tenant_schedulers.items()},
+        "autocomplete_cache": autocomplete_cache.snapshot(),
+    }
+
+
+@router.get("/slow-queries")
+async def slow_queries(limit: int = Query(20, ge=1, le=100)):
+    """Slow statements ranked by total time, plus the most recent occurrences."""
+    return {
+        "threshold_ms": SLOW_QUERY_THRESHOLD_MS,
+        "statements": slow_query_log.top(limit),
+        "recent": list(slow_query_log.recent)[-limit:],
+    }
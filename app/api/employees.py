@@ -1,22 +1,38 @@
+from typing import List
 from fastapi import APIRouter, Depends, HTTPException, Query, Body
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import and_, func
-from app.db.models import Employee, User
+from app.db.models import User
 from app.db.session import get_db
+from app.db.queries import HEADCOUNT_DIMENSIONS, build_search_query
+from app.db.records import EmployeeRecord, dumps_response
 from app.middleware.auth import get_current_user, create_access_token
-from app.config.org_cache import get_org_config
-from app.middleware.rate_limit import rate_limiter
+from app.config.org_cache import get_org_config, get_org_data_version
+from app.middleware.rate_limit import (
+    rate_limiter, autocomplete_rate_limiter, sync_rate_limiter, analytics_rate_limiter,
+    export_rate_limiter,
+)
+from app.middleware.admission import admission_control
+from app.middleware.tenant_scheduler import get_tenant_db
+from app.services.autocomplete import AUTOCOMPLETE_FIELDS, autocomplete_cache, search_from_db
+from app.services.sync import fetch_changes
+from app.services.bookmarks import MAX_PAGE, resolve_page
+from app.services.export import EXPORT_FORMATS, export_columns, stream_export
+from app.services.headcount import get_headcounts
 import bcrypt
 
 router = APIRouter()
 
 
-@router.get("/hr/{org_id}/employees/search")
+@router.get(
+    "/hr/{org_id}/employees/search",
+    dependencies=[Depends(admission_control("employee_search"))],
+)
 async def list_employees(
     org_id: int,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_tenant_db),
     limit: int = Query(20, ge=1, le=100),
     cursor: int = Query(None, description="The last seen employee id for key-set pagination"),
     status: str = Query(None),
@@ -25,6 +41,7 @@ async def list_employees(
     department: str = Query(None),
     position: str = Query(None),
     _: None = Depends(rate_limiter),
+    page: int = Query(None, ge=1, le=MAX_PAGE, description="Jump to a page instead of passing a cursor"),
 ):
     if org_id != current_user.org_id:
         raise HTTPException(status_code=404, detail="Organization not found")
@@ -32,53 +49,180 @@ async def list_employees(
     employee_fields = await get_org_config(org_id, db)
     if not employee_fields:
         raise HTTPException(status_code=404, detail="Organization not found")
-    
-    # Build filters
-    filters = [Employee.org_id == org_id]
-    if status:
-        filters.append(Employee.status == status)
-    if location:
-        filters.append(Employee.location == location)
-    if company:
-        filters.append(Employee.company == company)
-    if department:
-        filters.append(Employee.department == department)
-    if position:
-        filters.append(Employee.position == position)
-    if cursor is not None:
-        filters.append(Employee.id > cursor)
-    
-    # Build query with ordering
-    stmt = (
-        select(Employee, func.count().over().label("total_count"))
-        .where(and_(*filters))
-        .order_by(Employee.id)
-        .limit(limit)
-    )
-    
-    result = await db.execute(stmt)
-    rows = result.all()
-    employees = [row[0] for row in rows]
-    total_count = rows[0][1] if rows else 0
 
-    # Only return fields configured for the org, but always include 'id'
-    result_list = [
-        {**({'id': emp.id}), **{field: getattr(emp, field) for field in employee_fields if hasattr(emp, field) and field != 'id'}}
-        for emp in employees
-    ]
+    filters = {
+        "status": status,
+        "location": location,
+        "company": company,
+        "department": department,
+        "position": position,
+    }
+    offset = 0
+    if page is not None:
+        if cursor is not None:
+            raise HTTPException(status_code=400, detail="Use either page or cursor, not both")
+        # Turn the page into a keyset cursor via the bookmark index
+        cursor, offset = await resolve_page(db, org_id, page, limit, filters)
+
+    # Reuse the precompiled statement for this filter combination
+    stmt, params = build_search_query(org_id, limit, cursor, offset, **filters)
+
+    result = await db.execute(stmt, params)
+    rows = result.all()
+    employees = [EmployeeRecord.from_row(row) for row in rows]
+    total_count = rows[0].total_count if rows else 0
 
     next_cursor = employees[-1].id if len(employees) == limit else None
 
-    return {
+    # Records are written straight to JSON bytes, without per-row dicts
+    payload = {
         "limit": limit,
+        "page": page,
         "cursor": cursor,
         "next_cursor": next_cursor,
         "count": total_count,
-        "results": result_list,
     }
+    return Response(
+        dumps_response(payload, "results", employees, employee_fields), media_type="application/json"
+    )
+
+
+@router.get(
+    "/hr/{org_id}/employees/autocomplete",
+    dependencies=[Depends(admission_control("employee_autocomplete"))],
+)
+async def autocomplete_employees(
+    org_id: int,
+    q: str = Query(..., min_length=1, max_length=100, description="Prefix to complete"),
+    fields: List[str] = Query(["name"], description="Any of: name, department, position"),
+    limit: int = Query(10, ge=1, le=20),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_tenant_db),
+    _: None = Depends(autocomplete_rate_limiter),
+):
+    if org_id != current_user.org_id:
+        raise HTTPException(status_code=404, detail="Organization not found")
+    employee_fields = await get_org_config(org_id, db)
+    if not employee_fields:
+        raise HTTPException(status_code=404, detail="Organization not found")
+    unsupported = [field for field in fields if field not in AUTOCOMPLETE_FIELDS]
+    if unsupported:
+        raise HTTPException(status_code=400, detail=f"Unsupported autocomplete field: {unsupported[0]}")
+
+    # Only complete fields the org exposes in its directory
+    fields = [field for field in dict.fromkeys(fields) if field in employee_fields]
+    version = await get_org_data_version(org_id, db)
+    index = autocomplete_cache.get(org_id, version)
+    if index is not None:
+        results = {field: index.search(field, q, limit) for field in fields}
+    else:
+        results = {field: await search_from_db(db, org_id, field, q, limit) for field in fields}
+
+    return {"q": q, "limit": limit, "results": results}
+
+
+@router.get(
+    "/hr/{org_id}/employees/sync",
+    dependencies=[Depends(admission_control("employee_sync"))],
+)
+async def sync_employees(
+    org_id: int,
+    since: int = Query(0, ge=0, description="next_token from the previous sync, 0 for a full sync"),
+    limit: int = Query(500, ge=1, le=1000),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_tenant_db),
+    _: None = Depends(sync_rate_limiter),
+):
+    if org_id != current_user.org_id:
+        raise HTTPException(status_code=404, detail="Organization not found")
+    employee_fields = await get_org_config(org_id, db)
+    if not employee_fields:
+        raise HTTPException(status_code=404, detail="Organization not found")
+
+    upserts, deletes, next_token, has_more = await fetch_changes(db, org_id, since, limit)
+    payload = {"since": since, "next_token": next_token, "has_more": has_more, "deletes": deletes}
+    records = [EmployeeRecord.from_row(emp) for emp in upserts]
+    return Response(dumps_response(payload, "upserts", records, employee_fields), media_type="application/json")
+
+
+@router.get(
+    "/hr/{org_id}/employees/export",
+    # Exports stream for minutes; their duration says nothing about load
+    dependencies=[Depends(admission_control("employee_export", target_latency=None))],
+)
+async def export_employees(
+    org_id: int,
+    fmt: str = Query("arrow", alias="format", description="arrow (IPC stream) or parquet"),
+    status: str = Query(None),
+    location: str = Query(None),
+    company: str = Query(None),
+    department: str = Query(None),
+    position: str = Query(None),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_tenant_db),
+    _: None = Depends(export_rate_limiter),
+):
+    if org_id != current_user.org_id:
+        raise HTTPException(status_code=404, detail="Organization not found")
+    employee_fields = await get_org_config(org_id, db)
+    if not employee_fields:
+        raise HTTPException(status_code=404, detail="Organization not found")
+    if fmt not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported export format: {fmt}")
+
+    filters = {
+        "status": status,
+        "location": location,
+        "company": company,
+        "department": department,
+        "position": position,
+    }
+    media_type, extension = EXPORT_FORMATS[fmt]
+    # The session stays open until the response body has been sent
+    return StreamingResponse(
+        stream_export(db, org_id, export_columns(employee_fields), filters, fmt),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="employees-{org_id}.{extension}"'},
+    )
+
+
+@router.get(
+    "/hr/{org_id}/analytics/headcount",
+    dependencies=[Depends(admission_control("headcount_analytics"))],
+)
+async def headcount_analytics(
+    org_id: int,
+    group_by: List[str] = Query(
+        list(HEADCOUNT_DIMENSIONS), description="Any of: department, location, status"
+    ),
+    status: str = Query(None),
+    location: str = Query(None),
+    department: str = Query(None),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_tenant_db),
+    _: None = Depends(analytics_rate_limiter),
+):
+    if org_id != current_user.org_id:
+        raise HTTPException(status_code=404, detail="Organization not found")
+    employee_fields = await get_org_config(org_id, db)
+    if not employee_fields:
+        raise HTTPException(status_code=404, detail="Organization not found")
+    unsupported = [dimension for dimension in group_by if dimension not in HEADCOUNT_DIMENSIONS]
+    if unsupported:
+        raise HTTPException(status_code=400, detail=f"Unsupported group_by dimension: {unsupported[0]}")
+
+    # Only group by fields the org exposes in its directory, in canonical order
+    group_by = tuple(
+        dimension for dimension in HEADCOUNT_DIMENSIONS
+        if dimension in group_by and dimension in employee_fields
+    )
+    filters = {"status": status, "location": location, "department": department}
+    result = await get_headcounts(db, org_id, group_by, filters)
+    return {"group_by": list(group_by), **result}
 
 
-@router.post("/login")
+# bcrypt makes every login slower than the latency target
+@router.post("/login", dependencies=[Depends(admission_control("login", target_latency=None))])
 async def login(
     username: str = Body(...),
     password: str = Body(...),
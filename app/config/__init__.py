@@ -1,11 +1,57 @@
 import os
+import time
 import redis.asyncio as redis
+from prometheus_client import Counter, Histogram
 
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost")
 redis_client = None
 
+REDIS_COMMAND_LATENCY = Histogram(
+    "redis_command_latency_seconds",
+    "Redis command latency",
+    ["command"],
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1),
+)
+REDIS_COMMAND_ERRORS = Counter(
+    "redis_command_errors_total", "Redis commands that raised an error", ["command"]
+)
+
+
+class InstrumentedRedis(redis.Redis):
+    """Redis client that exports per-command latency and error counts."""
+
+    async def execute_command(self, *args, **options):
+        command = str(args[0]).upper()
+        start = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        except Exception:
+            REDIS_COMMAND_ERRORS.labels(command=command).inc()
+            raise
+        finally:
+            REDIS_COMMAND_LATENCY.labels(command=command).observe(time.perf_counter() - start)
+
 async def get_redis():
     global redis_client
     if redis_client is None:
-        redis_client = redis.from_url(REDIS_URL, decode_responses=True)
-    return redis_client 
\ No newline at end of file
+        redis_client = InstrumentedRedis.from_url(REDIS_URL, decode_responses=True)
+    return redis_client
+
+
+async def close_redis():
+    global redis_client
+    if redis_client is not None:
+        await redis_client.close()
+        redis_client = None
+
+
+def redis_pool_status():
+    if redis_client is None:
+        return {"connected": False}
+    pool = redis_client.connection_pool
+    return {
+        "connected": True,
+        "max_connections": pool.max_connections,
+        "in_use_connections": len(pool._in_use_connections),
+        "available_connections": len(pool._available_connections),
+    }
@@ -1,24 +1,229 @@
+import atexit
 import logging
-import structlog
+import os
+import queue
+import random
 import sys
+import time
+from collections import OrderedDict
+from logging.handlers import QueueHandler
+from threading import Event, Lock, Thread
+import structlog
 
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+# Per-event sampling rates, e.g. "db_session_attempt=0.01,warmup_step_done=0.5".
+# Only info and below are sampled; warnings and errors are always kept.
+LOG_SAMPLE_RATES = os.getenv("LOG_SAMPLE_RATES", "db_session_attempt=0.01")
+# At most LOG_DEDUP_MAX identical events are written per LOG_DEDUP_WINDOW seconds
+LOG_DEDUP_WINDOW = float(os.getenv("LOG_DEDUP_WINDOW", "10"))
+LOG_DEDUP_MAX = int(os.getenv("LOG_DEDUP_MAX", "5"))
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_FLUSH_INTERVAL = float(os.getenv("LOG_FLUSH_INTERVAL", "0.05"))  # seconds
+
+SAMPLED_LEVELS = {"debug", "info"}
+
+_writer = None
+
+
+def parse_sample_rates(value: str):
+    rates = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        event, rate = item.split("=")
+        rates[event.strip()] = float(rate)
+    return rates
+
+
+class EventSampler:
+    """structlog processor that keeps a configured fraction of selected events."""
+
+    def __init__(self, rates: dict):
+        self.rates = rates
+
+    def __call__(self, logger, method_name, event_dict):
+        rate = self.rates.get(event_dict.get("event"))
+        if rate is not None and method_name in SAMPLED_LEVELS and random.random() >= rate:
+            raise structlog.DropEvent
+        return event_dict
+
+
+class DuplicateSuppressor:
+    """structlog processor that rate-limits identical events.
+
+    Events are identical when their level and all key/value pairs match. The
+    first event after a suppressed stretch carries a ``suppressed`` count.
+    """
+
+    def __init__(
+        self,
+        window: float = LOG_DEDUP_WINDOW,
+        max_per_window: int = LOG_DEDUP_MAX,
+        max_keys: int = 10000,
+    ):
+        self.window = window
+        self.max_per_window = max_per_window
+        self.max_keys = max_keys
+        self.lock = Lock()
+        self.seen = OrderedDict()  # key -> [window_start, count, suppressed]
+
+    def __call__(self, logger, method_name, event_dict):
+        key = (method_name, repr(sorted(event_dict.items(), key=lambda item: item[0])))
+        now = time.monotonic()
+        with self.lock:
+            entry = self.seen.get(key)
+            if entry is None or now - entry[0] >= self.window:
+                suppressed = entry[2] if entry else 0
+                self.seen[key] = [now, 1, 0]
+                self.seen.move_to_end(key)
+                # Forget the oldest window; only its suppressed count is lost
+                if len(self.seen) > self.max_keys:
+                    self.seen.popitem(last=False)
+                if suppressed:
+                    event_dict["suppressed"] = suppressed
+                return event_dict
+            if entry[1] < self.max_per_window:
+                entry[1] += 1
+                return event_dict
+            entry[2] += 1
+        raise structlog.DropEvent
+
+
+class DeferredFormattingQueueHandler(QueueHandler):
+    """Queue handler that leaves rendering to the writer thread and never blocks."""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # structlog records carry the event dict and are rendered by the writer
+        if isinstance(record.msg, dict):
+            return record
+        return super().prepare(record)
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class BatchStreamHandler(logging.StreamHandler):
+    """Stream handler that leaves flushing to the writer, once per batch.
+
+    Without an explicit stream it writes to whatever ``sys.stdout`` is when a
+    batch is written, so a replaced and closed stdout (e.g. pytest's capture)
+    is never used from the writer thread.
+    """
+
+    def __init__(self, stream=None):
+        self.follows_stdout = stream is None
+        super().__init__(stream)
+
+    @property
+    def stream(self):
+        return sys.stdout if self.follows_stdout else self._stream
+
+    @stream.setter
+    def stream(self, value):
+        self._stream = value
+
+    def emit(self, record):
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+
+class BackgroundLogWriter:
+    """Thread that drains the log queue every ``flush_interval`` seconds.
+
+    Polling instead of blocking on the queue keeps the writer from waking (and
+    competing for the GIL) on every record logged by a request.
+    """
+
+    def __init__(self, log_queue, handler, flush_interval: float = LOG_FLUSH_INTERVAL):
+        self.queue = log_queue
+        self.handler = handler
+        self.flush_interval = flush_interval
+        self.stopped = Event()
+        self.thread = Thread(target=self._run, name="log-writer", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+
+    def _run(self):
+        while not self.stopped.wait(self.flush_interval):
+            self.drain()
+        self.drain()
+
+    def drain(self):
+        while True:
+            try:
+                record = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if record.levelno >= self.handler.level:
+                self.handler.handle(record)
+        try:
+            self.handler.flush()
+        except (OSError, ValueError):
+            # stdout may already be closed at interpreter exit
+            pass
+
+
+def setup_logging(stream=None):
+    """Configure structlog JSON logging through a background writer thread (idempotent)."""
+    global _writer
+    if _writer is not None:
+        return
+
+    output = BatchStreamHandler(stream)
+    output.setFormatter(structlog.stdlib.ProcessorFormatter(
+        processors=[
+            structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+            structlog.processors.JSONRenderer(),
+        ],
+        # Records from the stdlib (uvicorn, sqlalchemy) get the same JSON shape
+        foreign_pre_chain=[
+            structlog.stdlib.add_log_level,
+            structlog.processors.TimeStamper(fmt="iso"),
+        ],
+    ))
+    log_queue = queue.Queue(LOG_QUEUE_SIZE)
+    root = logging.getLogger()
+    root.handlers = [DeferredFormattingQueueHandler(log_queue)]
+    root.setLevel(LOG_LEVEL)
+    _writer = BackgroundLogWriter(log_queue, output)
+    _writer.start()
+    atexit.register(shutdown_logging)
 
-def setup_logging():
-    logging.basicConfig(
-        format="%(message)s",
-        stream=sys.stdout,
-        level=logging.INFO,
-    )
     structlog.configure(
         processors=[
+            structlog.stdlib.filter_by_level,
+            EventSampler(parse_sample_rates(LOG_SAMPLE_RATES)),
+            DuplicateSuppressor(),
             structlog.processors.TimeStamper(fmt="iso"),
             structlog.stdlib.add_log_level,
             structlog.processors.StackInfoRenderer(),
             structlog.processors.format_exc_info,
-            structlog.processors.JSONRenderer(),
+            structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
         ],
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
         wrapper_class=structlog.stdlib.BoundLogger,
         cache_logger_on_first_use=True,
-    ) 
\ No newline at end of file
+    )
+
+
+def shutdown_logging():
+    """Flush queued records and stop the writer thread."""
+    global _writer
+    if _writer is not None:
+        _writer.stop()
+        _writer = None
@@ -1,9 +1,13 @@
 import json
 from app.config import get_redis
-from app.db.models import Organization
+from app.db.models import Employee, EmployeeTombstone, Organization
+from sqlalchemy import func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+# The version changes on every write, so only cache it briefly
+ORG_DATA_VERSION_TTL = 5  # seconds
+
 async def get_org_config(org_id: int, db: AsyncSession):
     cache_key = f"org_config:{org_id}"
     redis_conn = await get_redis()
@@ -20,4 +24,28 @@ async def get_org_config(org_id: int, db: AsyncSession):
 async def set_org_config(org_id: int, employee_fields):
     cache_key = f"org_config:{org_id}"
     redis_conn = await get_redis()
-    await redis_conn.set(cache_key, json.dumps(employee_fields), ex=3600) 
\ No newline at end of file
+    await redis_conn.set(cache_key, json.dumps(employee_fields), ex=3600) 
+
+async def get_org_data_version(org_id: int, db: AsyncSession) -> int:
+    """Latest change sequence number of an org's employee data.
+
+    Every insert, update or delete bumps it (see the ``employees`` triggers),
+    so it can be used to key and invalidate caches derived from that data.
+    """
+    cache_key = f"org_data_version:{org_id}"
+    redis_conn = await get_redis()
+    version = await redis_conn.get(cache_key)
+    if version is not None:
+        return int(version)
+    stmt = select(func.greatest(
+        select(func.max(Employee.change_seq)).where(Employee.org_id == org_id).scalar_subquery(),
+        select(func.max(EmployeeTombstone.change_seq)).where(EmployeeTombstone.org_id == org_id).scalar_subquery(),
+    ))
+    version = (await db.execute(stmt)).scalar() or 0
+    await redis_conn.set(cache_key, version, ex=ORG_DATA_VERSION_TTL)
+    return version
+
+async def invalidate_org_data_version(org_id: int):
+    """Drop the cached version so the next read sees writes made by this process."""
+    redis_conn = await get_redis()
+    await redis_conn.delete(f"org_data_version:{org_id}")
@@ -0,0 +1,100 @@
+import time
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Overflow connections in use beyond pool_size",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled connection",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+POOL_CONNECTION_AGE = Histogram(
+    "db_pool_connection_age_seconds",
+    "Age of connections when they are checked out",
+    ["pool"],
+    buckets=(1, 10, 60, 300, 600, 1800, 3600, 7200),
+)
+POOL_CONNECTIONS_OPENED = Counter(
+    "db_pool_connections_opened_total", "New DBAPI connections opened", ["pool"]
+)
+POOL_INVALIDATIONS = Counter(
+    "db_pool_invalidations_total", "Connections invalidated", ["pool", "soft"]
+)
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool that records how long each checkout waits."""
+
+    metrics_label = "primary"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_CHECKOUT_WAIT.labels(pool=self.metrics_label).observe(time.perf_counter() - start)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics_label = self.metrics_label
+        return pool
+
+
+def instrument_engine(engine, name: str = "primary"):
+    """Export pool metrics for ``engine`` under ``pool=name``."""
+    sync_engine = engine.sync_engine
+    sync_engine.pool.metrics_label = name
+
+    def update_gauges():
+        # Look the pool up each time; engine.dispose() replaces it
+        pool = sync_engine.pool
+        POOL_CHECKED_OUT.labels(pool=name).set(pool.checkedout())
+        POOL_OVERFLOW.labels(pool=name).set(max(pool.overflow(), 0))
+
+    @event.listens_for(sync_engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        connection_record.info["connected_at"] = time.monotonic()
+        POOL_CONNECTIONS_OPENED.labels(pool=name).inc()
+
+    @event.listens_for(sync_engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        connected_at = connection_record.info.get("connected_at")
+        if connected_at is not None:
+            POOL_CONNECTION_AGE.labels(pool=name).observe(time.monotonic() - connected_at)
+        update_gauges()
+
+    @event.listens_for(sync_engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        update_gauges()
+
+    @event.listens_for(sync_engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        POOL_INVALIDATIONS.labels(pool=name, soft="false").inc()
+
+    @event.listens_for(sync_engine, "soft_invalidate")
+    def on_soft_invalidate(dbapi_connection, connection_record, exception):
+        POOL_INVALIDATIONS.labels(pool=name, soft="true").inc()
+
+
+def pool_status(engine):
+    pool = engine.sync_engine.pool
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "timeout": pool.timeout(),
+    }
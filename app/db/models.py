@@ -1,9 +1,12 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, JSON
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, ForeignKey, JSON, func
 from sqlalchemy.orm import declarative_base, relationship
-from sqlalchemy import Index
+from sqlalchemy import DDL, Index, Sequence, event
 
 Base = declarative_base()
 
+# Global change sequence for employee writes and deletes (see the triggers below)
+employee_change_seq = Sequence('employee_change_seq', metadata=Base.metadata)
+
 class Organization(Base):
     __tablename__ = 'organizations'
     id = Column(Integer, primary_key=True)
@@ -23,6 +26,10 @@ class Employee(Base):
     contact_info = Column(String)
     status = Column(String)  # e.g., 'active', 'inactive', etc.
     company = Column(String) # e.g., for multi-company orgs
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now())
+    # Maintained by trigger on every insert/update, used for incremental sync
+    change_seq = Column(BigInteger, nullable=False, server_default=employee_change_seq.next_value())
     organization = relationship('Organization', back_populates='employees')
 
     __table_args__ = (
@@ -32,8 +39,126 @@ class Employee(Base):
         Index('idx_employees_company', 'company'),
         Index('idx_employees_department', 'department'),
         Index('idx_employees_position', 'position'),
+        Index('idx_employees_org_change_seq', 'org_id', 'change_seq'),
+    )
+
+# Prefix lookups for name autocomplete (``lower(name) ~>=~ :prefix``)
+Index(
+    'idx_employees_org_name_prefix',
+    Employee.org_id,
+    func.lower(Employee.name).label('name_lower'),
+    postgresql_ops={'name_lower': 'text_pattern_ops'},
+)
+
+class EmployeeTombstone(Base):
+    """Deleted employees, kept so sync clients can remove them."""
+    __tablename__ = 'employee_tombstones'
+    employee_id = Column(Integer, primary_key=True)
+    org_id = Column(Integer, nullable=False)
+    change_seq = Column(BigInteger, nullable=False)
+    deleted_at = Column(DateTime, server_default=func.now())
+
+    __table_args__ = (
+        Index('idx_employee_tombstones_org_change_seq', 'org_id', 'change_seq'),
     )
 
+# Keep change_seq/updated_at current and record tombstones on delete or when an
+# employee moves to another org. Mirrors init.sql for tables created by init_db().
+# Timestamps use clock_timestamp() so they follow change_seq order, and each
+# writing transaction claims its change_seq range for sync (see app/services/sync.py).
+event.listen(Employee.__table__, 'after_create', DDL("""
+CREATE OR REPLACE FUNCTION claim_employee_changes() RETURNS void AS $$
+BEGIN
+    IF current_setting('employees.changes_claimed', true) IS DISTINCT FROM 'on' THEN
+        PERFORM pg_advisory_xact_lock_shared((SELECT last_value FROM employee_change_seq));
+        PERFORM set_config('employees.changes_claimed', 'on', true);
+    END IF;
+END;
+$$ LANGUAGE plpgsql
+""").execute_if(dialect='postgresql'))
+event.listen(Employee.__table__, 'after_create', DDL("""
+CREATE OR REPLACE FUNCTION employees_track_change() RETURNS trigger AS $$
+BEGIN
+    PERFORM claim_employee_changes();
+    IF TG_OP = 'DELETE' OR (TG_OP = 'UPDATE' AND OLD.org_id <> NEW.org_id) THEN
+        INSERT INTO employee_tombstones (employee_id, org_id, change_seq, deleted_at)
+        VALUES (OLD.id, OLD.org_id, nextval('employee_change_seq'), clock_timestamp())
+        ON CONFLICT (employee_id) DO UPDATE
+        SET org_id = EXCLUDED.org_id, change_seq = EXCLUDED.change_seq, deleted_at = EXCLUDED.deleted_at;
+    END IF;
+    IF TG_OP = 'DELETE' THEN
+        RETURN OLD;
+    END IF;
+    NEW.change_seq := nextval('employee_change_seq');
+    NEW.updated_at := clock_timestamp();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql
+""").execute_if(dialect='postgresql'))
+event.listen(Employee.__table__, 'after_create', DDL("""
+CREATE TRIGGER employees_track_change
+    BEFORE INSERT OR UPDATE OR DELETE ON employees
+    FOR EACH ROW EXECUTE FUNCTION employees_track_change()
+""").execute_if(dialect='postgresql'))
+
+class EmployeeHeadcount(Base):
+    """Employee count per org, department, location and status.
+
+    Maintained by the ``employees_maintain_headcounts`` trigger rather than
+    recomputed. Missing dimension values are stored as ''.
+    """
+    __tablename__ = 'employee_headcounts'
+    org_id = Column(Integer, primary_key=True)
+    department = Column(String, primary_key=True, server_default='')
+    location = Column(String, primary_key=True, server_default='')
+    status = Column(String, primary_key=True, server_default='')
+    headcount = Column(Integer, nullable=False, server_default='0')
+
+# Move one employee between headcount rows on insert, delete, or a change of
+# org or dimension. Mirrors init.sql for tables created by init_db().
+event.listen(Employee.__table__, 'after_create', DDL("""
+CREATE OR REPLACE FUNCTION employees_maintain_headcounts() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE'
+        AND OLD.org_id = NEW.org_id
+        AND OLD.department IS NOT DISTINCT FROM NEW.department
+        AND OLD.location IS NOT DISTINCT FROM NEW.location
+        AND OLD.status IS NOT DISTINCT FROM NEW.status THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE employee_headcounts SET headcount = headcount - 1
+        WHERE org_id = OLD.org_id
+            AND department = coalesce(OLD.department, '')
+            AND location = coalesce(OLD.location, '')
+            AND status = coalesce(OLD.status, '');
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO employee_headcounts (org_id, department, location, status, headcount)
+        VALUES (NEW.org_id, coalesce(NEW.department, ''), coalesce(NEW.location, ''), coalesce(NEW.status, ''), 1)
+        ON CONFLICT (org_id, department, location, status)
+        DO UPDATE SET headcount = employee_headcounts.headcount + 1;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+""").execute_if(dialect='postgresql'))
+event.listen(Employee.__table__, 'after_create', DDL("""
+CREATE TRIGGER employees_maintain_headcounts
+    AFTER INSERT OR UPDATE OF org_id, department, location, status OR DELETE ON employees
+    FOR EACH ROW EXECUTE FUNCTION employees_maintain_headcounts()
+""").execute_if(dialect='postgresql'))
+
+class OrgShard(Base):
+    """Shard directory, kept on the primary database.
+
+    Orgs without a row are placed by consistent hashing (see app.db.sharding).
+    """
+    __tablename__ = 'org_shards'
+    org_id = Column(Integer, primary_key=True)
+    shard = Column(String, nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
 class User(Base):
     __tablename__ = 'users'
     id = Column(Integer, primary_key=True)
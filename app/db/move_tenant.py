@@ -0,0 +1,263 @@
+"""Move an org's employee data to another shard and flip its routing.
+
+    python -m app.db.move_tenant move <org_id> <target_shard> [--purge-target] [--delete-source]
+    python -m app.db.move_tenant place <org_id>
+
+``move`` runs these steps:
+
+1. Copy the org row to the target and advance the target's change sequence past
+   the source's.
+2. Copy employees and deletions in change order through the incremental sync
+   feed until the target has caught up. Employee ids are kept, so shards should
+   hand out disjoint id ranges (see init-shard.sql).
+3. Point the org's ``org_shards`` entry at the target.
+4. Wait until every worker's cached route has expired and late writes on the
+   source are visible, then copy whatever was written to the source meanwhile.
+5. Advance the target's change sequence past the source's again and give every
+   row and tombstone of the org a new change number. Other orgs keep advancing
+   the source's sequence during the move, so sync tokens handed out by the
+   source can be above the numbers the copies received; afterwards clients
+   receive every row of the org once more instead of missing some.
+6. With ``--delete-source``, remove the org's rows from the source.
+
+``place`` puts a new org, which has no employees yet, on the shard the hash
+ring picks and records it in ``org_shards``. Orgs without an entry stay on the
+primary, so adding a shard never reroutes existing orgs.
+"""
+import argparse
+import asyncio
+import structlog
+from sqlalchemy import delete, func, text, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.future import select
+from app.config.org_cache import invalidate_org_data_version
+from app.db.models import Employee, EmployeeHeadcount, EmployeeTombstone, Organization, OrgShard
+from app.db.session import AsyncSessionLocal
+from app.db.sharding import PRIMARY_SHARD, SHARD_DIRECTORY_TTL, shard_router
+from app.services.sync import CLAIM_CHANGES, fetch_changes, wait_for_pending_changes
+
+logger = structlog.get_logger()
+
+COPY_BATCH_SIZE = 1000
+# Columns copied as-is; change_seq and updated_at are assigned by the target's trigger
+EMPLOYEE_COLUMNS = (
+    "id", "org_id", "name", "department", "location", "position",
+    "contact_info", "status", "company", "created_at",
+)
+
+
+class MoveError(Exception):
+    pass
+
+
+async def copy_batch(target, org_id: int, upserts, deleted_ids):
+    if upserts:
+        stmt = insert(Employee).values([
+            {column: getattr(emp, column) for column in EMPLOYEE_COLUMNS} for emp in upserts
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Employee.id],
+            set_={column: stmt.excluded[column] for column in EMPLOYEE_COLUMNS if column != "id"},
+            # Never overwrite another org's employee that happens to share the id
+            where=Employee.org_id == stmt.excluded.org_id,
+        ).returning(Employee.id)
+        written = set((await target.execute(stmt)).scalars().all())
+        conflicting = sorted(emp.id for emp in upserts if emp.id not in written)
+        if conflicting:
+            raise MoveError(f"employee ids used by another org on the target: {conflicting[:10]}")
+    if deleted_ids:
+        await target.execute(
+            delete(Employee).where(Employee.org_id == org_id, Employee.id.in_(deleted_ids))
+        )
+        # Rows that never reached the target still need a tombstone for sync clients
+        await target.execute(CLAIM_CHANGES)
+        await target.execute(
+            insert(EmployeeTombstone)
+            .values([
+                {"employee_id": emp_id, "org_id": org_id, "change_seq": func.nextval("employee_change_seq")}
+                for emp_id in deleted_ids
+            ])
+            .on_conflict_do_nothing()
+        )
+
+
+async def catch_up(org_id: int, source: str, target: str, since: int = 0, batch_size: int = COPY_BATCH_SIZE):
+    """Copy changes after ``since`` from source to target; return the last token copied."""
+    copied = 0
+    while True:
+        async with shard_router.session(source) as src:
+            upserts, deleted_ids, next_token, has_more = await fetch_changes(src, org_id, since, batch_size)
+        if upserts or deleted_ids:
+            async with shard_router.session(target) as dst:
+                await copy_batch(dst, org_id, upserts, deleted_ids)
+                await dst.commit()
+            copied += len(upserts) + len(deleted_ids)
+        since = next_token
+        if not has_more:
+            logger.info("tenant_move_caught_up", org_id=org_id, changes=copied, token=since)
+            return since
+
+
+async def source_change_seq(shard: str) -> int:
+    async with shard_router.session(shard) as db:
+        return (await db.execute(text("SELECT last_value FROM employee_change_seq"))).scalar()
+
+
+async def raise_change_seq(db, seq: int):
+    await db.execute(
+        text("SELECT setval('employee_change_seq', greatest((SELECT last_value FROM employee_change_seq), :seq))"),
+        {"seq": seq},
+    )
+
+
+async def restamp_target(org_id: int, source: str, target: str):
+    """Renumber the org's changes on the target above every token the source handed out."""
+    source_seq = await source_change_seq(source)
+    async with shard_router.session(target) as dst:
+        await raise_change_seq(dst, source_seq)
+        await dst.execute(CLAIM_CHANGES)
+        # The change trigger assigns each updated row a new change_seq
+        await dst.execute(update(Employee).where(Employee.org_id == org_id).values(id=Employee.id))
+        await dst.execute(
+            update(EmployeeTombstone)
+            .where(EmployeeTombstone.org_id == org_id)
+            .values(change_seq=func.nextval("employee_change_seq"), deleted_at=func.clock_timestamp())
+        )
+        await dst.commit()
+    logger.info("tenant_move_restamped", org_id=org_id, target=target, source_seq=source_seq)
+
+
+async def prepare_target(org_id: int, source: str, target: str, purge_target: bool):
+    async with AsyncSessionLocal() as primary:
+        org = (await primary.execute(
+            select(Organization).where(Organization.id == org_id)
+        )).scalar_one_or_none()
+    if org is None:
+        raise MoveError(f"unknown org {org_id}")
+    source_seq = await source_change_seq(source)
+
+    async with shard_router.session(target) as dst:
+        existing = (await dst.execute(
+            select(func.count()).select_from(Employee).where(Employee.org_id == org_id)
+        )).scalar()
+        if existing and not purge_target:
+            raise MoveError(
+                f"target already has {existing} employees of org {org_id}; pass --purge-target to replace them"
+            )
+        for model in (Employee, EmployeeTombstone, EmployeeHeadcount):
+            await dst.execute(delete(model).where(model.org_id == org_id))
+        # employees.org_id references organizations on every shard
+        stmt = insert(Organization).values(id=org.id, name=org.name, employee_fields=org.employee_fields)
+        await dst.execute(stmt.on_conflict_do_update(
+            index_elements=[Organization.id],
+            set_={"name": stmt.excluded.name, "employee_fields": stmt.excluded.employee_fields},
+        ))
+        await raise_change_seq(dst, source_seq)
+        await dst.commit()
+
+
+async def advance_id_sequence(shard: str):
+    # Copied rows keep their ids; new inserts on the shard must not reuse them
+    async with shard_router.session(shard) as db:
+        await db.execute(text(
+            "SELECT setval('employees_id_seq', greatest("
+            "(SELECT last_value FROM employees_id_seq), (SELECT coalesce(max(id), 1) FROM employees)))"
+        ))
+        await db.commit()
+
+
+async def set_route(org_id: int, shard: str):
+    async with AsyncSessionLocal() as primary:
+        stmt = insert(OrgShard).values(org_id=org_id, shard=shard)
+        await primary.execute(stmt.on_conflict_do_update(
+            index_elements=[OrgShard.org_id],
+            set_={"shard": shard, "updated_at": func.now()},
+        ))
+        await primary.commit()
+    shard_router.forget(org_id)
+
+
+async def delete_from_shard(org_id: int, shard: str):
+    async with shard_router.session(shard) as db:
+        for model in (Employee, EmployeeTombstone, EmployeeHeadcount):
+            await db.execute(delete(model).where(model.org_id == org_id))
+        await db.commit()
+
+
+async def move_tenant(org_id: int, target: str, purge_target: bool = False, delete_source: bool = False):
+    if target not in shard_router.engines:
+        raise MoveError(f"unknown shard {target}; configured: {sorted(shard_router.engines)}")
+    async with AsyncSessionLocal() as primary:
+        source = await shard_router.shard_for(org_id, primary)
+    if source == target:
+        raise MoveError(f"org {org_id} already lives on {target}")
+
+    logger.info("tenant_move_started", org_id=org_id, source=source, target=target)
+    await prepare_target(org_id, source, target, purge_target)
+    token = await catch_up(org_id, source, target)
+    await advance_id_sequence(target)
+    await set_route(org_id, target)
+    logger.info("tenant_move_routed", org_id=org_id, target=target)
+
+    # Workers keep their cached route for SHARD_DIRECTORY_TTL; writes they
+    # started on the source before that must commit before the last copy
+    await asyncio.sleep(SHARD_DIRECTORY_TTL)
+    async with shard_router.session(source) as src:
+        await wait_for_pending_changes(src)
+    await catch_up(org_id, source, target, since=token)
+    await advance_id_sequence(target)
+    await restamp_target(org_id, source, target)
+    try:
+        await invalidate_org_data_version(org_id)
+    except Exception as e:
+        logger.warning("tenant_move_cache_invalidation_failed", org_id=org_id, error=str(e))
+
+    if delete_source:
+        await delete_from_shard(org_id, source)
+        logger.info("tenant_move_source_deleted", org_id=org_id, source=source)
+    logger.info("tenant_move_complete", org_id=org_id, source=source, target=target)
+
+
+async def place_org(org_id: int) -> str:
+    """Put a new org on the shard the hash ring picks and record it."""
+    async with AsyncSessionLocal() as primary:
+        placed = (await primary.execute(
+            select(OrgShard.shard).where(OrgShard.org_id == org_id)
+        )).scalar_one_or_none()
+        employees = (await primary.execute(
+            select(func.count()).select_from(Employee).where(Employee.org_id == org_id)
+        )).scalar()
+    if placed is not None:
+        raise MoveError(f"org {org_id} is already placed on {placed}")
+    if employees:
+        raise MoveError(f"org {org_id} already has {employees} employees on the primary; use move")
+
+    shard = shard_router.placement(org_id)
+    if shard != PRIMARY_SHARD:
+        await prepare_target(org_id, PRIMARY_SHARD, shard, purge_target=False)
+    await set_route(org_id, shard)
+    logger.info("tenant_placed", org_id=org_id, shard=shard)
+    return shard
+
+
+async def main(args):
+    try:
+        if args.command == "place":
+            await place_org(args.org_id)
+        else:
+            await move_tenant(args.org_id, args.target, args.purge_target, args.delete_source)
+    finally:
+        await shard_router.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move tenants between shards")
+    commands = parser.add_subparsers(dest="command", required=True)
+    move = commands.add_parser("move", help="copy an org to another shard and route it there")
+    move.add_argument("org_id", type=int)
+    move.add_argument("target")
+    move.add_argument("--purge-target", action="store_true", help="replace the org's rows already on the target")
+    move.add_argument("--delete-source", action="store_true", help="delete the org's rows from the source afterwards")
+    place = commands.add_parser("place", help="put a new org on the shard the hash ring picks")
+    place.add_argument("org_id", type=int)
+    asyncio.run(main(parser.parse_args()))
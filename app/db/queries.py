@@ -0,0 +1,95 @@
+from functools import lru_cache
+from sqlalchemy import and_, bindparam, func
+from sqlalchemy.future import select
+from app.db.models import Employee, EmployeeHeadcount
+
+# Optional equality filters accepted by the search endpoint. The order is fixed
+# so that a given filter combination always maps to the same cache entry.
+SEARCH_FILTERS = ("status", "location", "company", "department", "position")
+# Dimensions of the employee_headcounts summary table, in canonical order
+HEADCOUNT_DIMENSIONS = ("department", "location", "status")
+
+
+def active_filters(filters: dict):
+    """Return the ``(key, value)`` pairs of the filters that are set, in canonical order."""
+    return tuple((key, filters[key]) for key in SEARCH_FILTERS if filters.get(key))
+
+
+def _search_conditions(filter_keys: tuple, with_cursor: bool):
+    conditions = [Employee.org_id == bindparam("org_id")]
+    for key in filter_keys:
+        conditions.append(getattr(Employee, key) == bindparam(key))
+    if with_cursor:
+        conditions.append(Employee.id > bindparam("cursor"))
+    return and_(*conditions)
+
+
+@lru_cache(maxsize=128)
+def get_search_statement(filter_keys: tuple, with_cursor: bool, with_offset: bool = False):
+    """Return the cached search statement for a filter combination.
+
+    Every value is a bind parameter, so the statement object (and its memoized
+    cache key) is built once per combination and reused for every request.
+    Columns are selected as plain values, so no ORM instances are built per row.
+    """
+    stmt = (
+        select(*Employee.__table__.c, func.count().over().label("total_count"))
+        .where(_search_conditions(filter_keys, with_cursor))
+        .order_by(Employee.id)
+        .limit(bindparam("limit"))
+    )
+    if with_offset:
+        stmt = stmt.offset(bindparam("offset"))
+    return stmt
+
+
+@lru_cache(maxsize=64)
+def get_bookmark_statement(filter_keys: tuple):
+    """Return the ids at every ``stride``-th position of a filtered result."""
+    numbered = (
+        select(Employee.id, func.row_number().over(order_by=Employee.id).label("position"))
+        .where(_search_conditions(filter_keys, False))
+        .subquery()
+    )
+    return (
+        select(numbered.c.id)
+        .where(numbered.c.position % bindparam("stride") == 0)
+        .order_by(numbered.c.id)
+    )
+
+
+@lru_cache(maxsize=128)
+def get_export_statement(columns: tuple, filter_keys: tuple):
+    """Select only the exported columns of a filtered result, in id order."""
+    return (
+        select(*(getattr(Employee, column) for column in columns))
+        .where(_search_conditions(filter_keys, False))
+        .order_by(Employee.id)
+    )
+
+
+@lru_cache(maxsize=64)
+def get_headcount_statement(group_by: tuple, filter_keys: tuple):
+    """Sum the summary rows of an org by ``group_by``; cost depends on its distinct groups only."""
+    columns = [getattr(EmployeeHeadcount, dimension) for dimension in group_by]
+    conditions = [EmployeeHeadcount.org_id == bindparam("org_id"), EmployeeHeadcount.headcount > 0]
+    for key in filter_keys:
+        conditions.append(getattr(EmployeeHeadcount, key) == bindparam(key))
+    return (
+        select(*columns, func.sum(EmployeeHeadcount.headcount).label("headcount"))
+        .where(and_(*conditions))
+        .group_by(*columns)
+        .order_by(*columns)
+    )
+
+
+def build_search_query(org_id: int, limit: int, cursor: int = None, offset: int = None, **filters):
+    """Return the ``(statement, params)`` pair for an employee search."""
+    active = active_filters(filters)
+    params = {"org_id": org_id, "limit": limit, **dict(active)}
+    if cursor is not None:
+        params["cursor"] = cursor
+    if offset:
+        params["offset"] = offset
+    filter_keys = tuple(key for key, _ in active)
+    return get_search_statement(filter_keys, cursor is not None, bool(offset)), params
@@ -0,0 +1,104 @@
+import json
+import sys
+from json.encoder import encode_basestring_ascii
+from app.db.models import Employee
+
+# Every mapped employee column; an org's employee_fields may expose any of them
+RECORD_FIELDS = tuple(Employee.__table__.columns.keys())
+# Low-cardinality columns: one string object per distinct value, shared by all rows
+CATEGORICAL_FIELDS = ("department", "location", "position", "status", "company")
+# Encoded categorical values kept for reuse; cleared when full
+JSON_FRAGMENT_CACHE_SIZE = 4096
+
+_json_fragments = {}
+
+
+def _intern(value):
+    return sys.intern(value) if value is not None else None
+
+
+def _json_fragment(value) -> bytes:
+    """JSON encoding of a value, memoized for categorical strings."""
+    fragment = _json_fragments.get(value)
+    if fragment is None:
+        fragment = _encode(value)
+        if len(_json_fragments) >= JSON_FRAGMENT_CACHE_SIZE:
+            _json_fragments.clear()
+        _json_fragments[value] = fragment
+    return fragment
+
+
+def _encode(value) -> bytes:
+    if value is None:
+        return b"null"
+    if isinstance(value, str):
+        return encode_basestring_ascii(value).encode("ascii")
+    if isinstance(value, int):
+        return str(value).encode("ascii")
+    # created_at / updated_at; FastAPI's encoder renders datetimes the same way
+    return b'"' + value.isoformat().encode("ascii") + b'"'
+
+
+class EmployeeRecord:
+    """Read-only employee row shared by queries, caches and serializers.
+
+    Uses ``__slots__`` instead of a per-instance dict, and interns categorical
+    values so that e.g. every "Engineering" row points at the same string.
+    """
+
+    __slots__ = RECORD_FIELDS
+
+    def __init__(self, **values):
+        for field in RECORD_FIELDS:
+            value = values.get(field)
+            setattr(self, field, _intern(value) if field in CATEGORICAL_FIELDS else value)
+
+    @classmethod
+    def from_row(cls, row):
+        """Build a record from an ``Employee`` instance or a row with the same attributes."""
+        return cls(**{field: getattr(row, field, None) for field in RECORD_FIELDS})
+
+    def __eq__(self, other):
+        if not isinstance(other, EmployeeRecord):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in RECORD_FIELDS)
+
+    def __repr__(self):
+        return f"EmployeeRecord(id={self.id!r}, name={self.name!r})"
+
+    def project(self, employee_fields):
+        """Only return fields configured for the org, but always include 'id'."""
+        return {"id": self.id, **{field: getattr(self, field) for field in record_fields(employee_fields)}}
+
+    def to_json(self, fields) -> bytes:
+        """JSON object of ``fields``, as returned by :func:`record_fields`."""
+        parts = [b'{"id":', str(self.id).encode("ascii")]
+        for field in fields:
+            value = getattr(self, field)
+            parts.append(_FIELD_KEYS[field])
+            parts.append(_json_fragment(value) if field in CATEGORICAL_FIELDS else _encode(value))
+        parts.append(b"}")
+        return b"".join(parts)
+
+
+_FIELD_KEYS = {field: b',"' + field.encode("ascii") + b'":' for field in RECORD_FIELDS}
+
+
+def record_fields(employee_fields):
+    """The org's configured fields that a record carries, without 'id', in configured order."""
+    return tuple(
+        field for field in dict.fromkeys(employee_fields) if field in RECORD_FIELDS and field != "id"
+    )
+
+
+def dumps_records(records, employee_fields) -> bytes:
+    """Serialize records to a JSON array of their projections without building dicts."""
+    fields = record_fields(employee_fields)
+    return b"[" + b",".join(record.to_json(fields) for record in records) + b"]"
+
+
+def dumps_response(payload: dict, key: str, records, employee_fields) -> bytes:
+    """JSON object of ``payload`` plus ``key`` holding the projected records."""
+    head = json.dumps(payload, separators=(",", ":")).encode()[:-1]
+    separator = b"," if payload else b""
+    return head + separator + b'"' + key.encode() + b'":' + dumps_records(records, employee_fields) + b"}"
@@ -3,6 +3,8 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy import text
 # from sqlalchemy.exc import OperationalError, AuthenticationFailed
 from app.db.models import Base
+from app.db.instrumentation import InstrumentedAsyncQueuePool, instrument_engine
+from app.db.slow_queries import install_slow_query_capture
 import os
 import asyncio
 from typing import Optional
@@ -16,28 +18,49 @@ logger = structlog.get_logger()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
+# Size of asyncpg's per-connection prepared statement cache. Search statements
+# are keyed by filter combination, so this only needs to cover a few dozen.
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "256"))
+# Seconds to wait for a pooled connection before failing the request with 503
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# Per process: with N workers the service opens up to N * (size + overflow)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+# Log every SQL statement; slow ones are captured by app.db.slow_queries instead
+DB_ECHO = os.getenv("DB_ECHO", "false").lower() == "true"
 
 # Validate DATABASE_URL
 if not DATABASE_URL:
     raise ValueError("DATABASE_URL environment variable is not set")
 
 
-# Create engine with better configuration
-engine = create_async_engine(
-    DATABASE_URL,
-    echo=True,
-    pool_pre_ping=True,  # Verify connections before use
-    pool_size=10,        # Connection pool size
-    max_overflow=20,     # Maximum overflow connections
-    pool_reset_on_return='commit',
-    pool_timeout=30,
-    pool_recycle=3600,  # Recycle connections every hour
-    connect_args={
-        "server_settings": {
-            "application_name": "employee_search_service"
+def make_engine(url: str, name: str):
+    """Create an instrumented engine; every database (primary or shard) gets its own pool."""
+    db_engine = create_async_engine(
+        url,
+        echo=DB_ECHO,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_pre_ping=True,  # Verify connections before use
+        pool_size=DB_POOL_SIZE,        # Connection pool size
+        max_overflow=DB_MAX_OVERFLOW,  # Maximum overflow connections
+        pool_reset_on_return='commit',
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=3600,  # Recycle connections every hour
+        query_cache_size=1200,  # SQLAlchemy compiled statement cache
+        connect_args={
+            "prepared_statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+            "server_settings": {
+                "application_name": "employee_search_service"
+            }
         }
-    }
-)
+    )
+    instrument_engine(db_engine, name)
+    install_slow_query_capture(db_engine)
+    return db_engine
+
+
+# Create engine with better configuration
+engine = make_engine(DATABASE_URL, "primary")
 
 AsyncSessionLocal = sessionmaker(
     bind=engine,
@@ -0,0 +1,166 @@
+import asyncio
+import bisect
+import hashlib
+import os
+import time
+from contextlib import asynccontextmanager
+import structlog
+from prometheus_client import Counter, Gauge
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import sessionmaker
+from app.db.models import OrgShard
+from app.db.session import AsyncSessionLocal, engine, make_engine
+
+logger = structlog.get_logger()
+
+# The primary database always is a shard; it also holds the org_shards
+# directory, organizations and users
+PRIMARY_SHARD = "primary"
+# Additional tenant databases, e.g. "shard1=postgresql+asyncpg://...,shard2=..."
+SHARD_DATABASE_URLS = os.getenv("SHARD_DATABASE_URLS", "")
+# How long a worker trusts its cached directory entries. Tenant moves wait this
+# long after flipping routing before the final catch-up.
+SHARD_DIRECTORY_TTL = float(os.getenv("SHARD_DIRECTORY_TTL", "30"))  # seconds
+SHARD_HEALTH_INTERVAL = float(os.getenv("SHARD_HEALTH_INTERVAL", "15"))  # seconds
+SHARD_HEALTH_TIMEOUT = 2  # seconds
+SHARD_VIRTUAL_NODES = 64
+
+SHARD_UP = Gauge(
+    "db_shard_up",
+    "1 if the shard answered its last health check",
+    ["shard"],
+    multiprocess_mode="livemin",
+)
+SHARD_PING = Gauge(
+    "db_shard_ping_seconds",
+    "Latency of the last shard health check",
+    ["shard"],
+    multiprocess_mode="livemax",
+)
+SHARD_SESSIONS = Counter(
+    "db_shard_sessions_total", "Tenant sessions handed out", ["shard"]
+)
+
+
+def parse_shard_urls(value: str):
+    urls = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        name, url = item.split("=", 1)
+        urls[name.strip()] = url.strip()
+    return urls
+
+
+class HashRing:
+    """Consistent hash ring; adding a shard only remaps about 1/N of the orgs."""
+
+    def __init__(self, nodes, replicas: int = SHARD_VIRTUAL_NODES):
+        points = sorted((self._hash(f"{node}#{i}"), node) for node in nodes for i in range(replicas))
+        self.keys = [point for point, _ in points]
+        self.nodes = [node for _, node in points]
+
+    @staticmethod
+    def _hash(value: str) -> int:
+        return int.from_bytes(hashlib.md5(value.encode()).digest()[:8], "big")
+
+    def get(self, key) -> str:
+        index = bisect.bisect(self.keys, self._hash(str(key))) % len(self.keys)
+        return self.nodes[index]
+
+
+class ShardRouter:
+    """Maps orgs to shards through the ``org_shards`` directory.
+
+    Orgs without a directory entry live on the primary, where organizations
+    are created. The hash ring only picks the shard for a newly placed org.
+    """
+
+    def __init__(self, engines: dict, directory_ttl: float = SHARD_DIRECTORY_TTL):
+        self.engines = engines
+        self.sessionmakers = {
+            name: AsyncSessionLocal if name == PRIMARY_SHARD else sessionmaker(
+                bind=shard_engine, class_=AsyncSession, expire_on_commit=False
+            )
+            for name, shard_engine in engines.items()
+        }
+        self.ring = HashRing(sorted(engines))
+        self.directory_ttl = directory_ttl
+        self.routes = {}  # org_id -> (shard, expires_at)
+
+    async def shard_for(self, org_id: int, db) -> str:
+        """Return the shard holding ``org_id``; ``db`` is a primary session."""
+        if len(self.engines) == 1:
+            return PRIMARY_SHARD
+        now = time.monotonic()
+        cached = self.routes.get(org_id)
+        if cached is not None and cached[1] > now:
+            return cached[0]
+        shard = (await db.execute(
+            select(OrgShard.shard).where(OrgShard.org_id == org_id)
+        )).scalar_one_or_none()
+        if shard not in self.engines:
+            if shard is not None:
+                logger.warning("unknown_shard_in_directory", org_id=org_id, shard=shard)
+            shard = PRIMARY_SHARD
+        self.routes[org_id] = (shard, now + self.directory_ttl)
+        return shard
+
+    def placement(self, org_id: int) -> str:
+        """Shard for an org that has no data yet."""
+        return self.ring.get(org_id)
+
+    def session(self, shard: str) -> AsyncSession:
+        SHARD_SESSIONS.labels(shard=shard).inc()
+        return self.sessionmakers[shard]()
+
+    @asynccontextmanager
+    async def tenant_session(self, org_id: int):
+        """Session on the org's shard, for work outside a request."""
+        async with AsyncSessionLocal() as primary:
+            shard = await self.shard_for(org_id, primary)
+        async with self.session(shard) as db:
+            yield db
+
+    def forget(self, org_id: int):
+        self.routes.pop(org_id, None)
+
+    async def check_health(self):
+        for name, shard_engine in self.engines.items():
+            start = time.perf_counter()
+            try:
+                async with shard_engine.connect() as conn:
+                    await asyncio.wait_for(conn.execute(text("SELECT 1")), SHARD_HEALTH_TIMEOUT)
+            except Exception as e:
+                SHARD_UP.labels(shard=name).set(0)
+                logger.warning("shard_health_check_failed", shard=name, error=str(e))
+                continue
+            SHARD_UP.labels(shard=name).set(1)
+            SHARD_PING.labels(shard=name).set(time.perf_counter() - start)
+
+    async def monitor_health(self, interval: float = SHARD_HEALTH_INTERVAL):
+        while True:
+            await self.check_health()
+            await asyncio.sleep(interval)
+
+    def snapshot(self):
+        now = time.monotonic()
+        return {
+            "shards": sorted(self.engines),
+            "routes": {
+                org_id: shard for org_id, (shard, expires_at) in self.routes.items() if expires_at > now
+            },
+        }
+
+    async def dispose(self):
+        for shard_engine in self.engines.values():
+            await shard_engine.dispose()
+
+
+shard_engines = {
+    PRIMARY_SHARD: engine,
+    **{name: make_engine(url, name) for name, url in parse_shard_urls(SHARD_DATABASE_URLS).items()},
+}
+shard_router = ShardRouter(shard_engines)
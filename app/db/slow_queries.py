@@ -0,0 +1,160 @@
+import json
+import os
+import random
+import re
+import time
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+import structlog
+from sqlalchemy import event
+
+logger = structlog.get_logger()
+
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+# Fraction of slow SELECTs re-run under EXPLAIN (ANALYZE, BUFFERS)
+SLOW_QUERY_EXPLAIN_SAMPLE_RATE = float(os.getenv("SLOW_QUERY_EXPLAIN_SAMPLE_RATE", "0.05"))
+SLOW_QUERY_RING_SIZE = int(os.getenv("SLOW_QUERY_RING_SIZE", "100"))
+SLOW_QUERY_MAX_STATEMENTS = 500
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w$])\d+(?:\.\d+)?\b")
+
+
+def normalize_sql(statement: str) -> str:
+    """Collapse whitespace and replace inline literals so equal queries group together."""
+    statement = _STRING_LITERAL.sub("?", statement)
+    statement = _NUMBER_LITERAL.sub("?", statement)
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+def parameter_shape(parameters, executemany: bool = False):
+    """Describe bind parameters by type only, never by value."""
+    if executemany:
+        return {
+            "executemany": len(parameters),
+            "row": parameter_shape(parameters[0]) if parameters else None,
+        }
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+class SlowQueryLog:
+    """Bounded ring of recent slow queries plus per-statement aggregates."""
+
+    def __init__(
+        self,
+        ring_size: int = SLOW_QUERY_RING_SIZE,
+        max_statements: int = SLOW_QUERY_MAX_STATEMENTS,
+    ):
+        self.recent = deque(maxlen=ring_size)
+        self.max_statements = max_statements
+        self.statements = OrderedDict()  # normalized sql -> aggregate
+
+    def record(self, sql: str, duration_ms: float, params, plan=None):
+        self.recent.append({
+            "at": datetime.now(timezone.utc).isoformat(),
+            "sql": sql,
+            "duration_ms": round(duration_ms, 2),
+            "params": params,
+            "plan": plan,
+        })
+        stats = self.statements.get(sql)
+        if stats is None:
+            stats = self.statements[sql] = {
+                "sql": sql, "count": 0, "total_ms": 0.0, "max_ms": 0.0, "params": params, "plan": None,
+            }
+            # Forget the least recently seen statement
+            while len(self.statements) > self.max_statements:
+                self.statements.popitem(last=False)
+        self.statements.move_to_end(sql)
+        stats["count"] += 1
+        stats["total_ms"] += duration_ms
+        stats["max_ms"] = max(stats["max_ms"], duration_ms)
+        if plan is not None:
+            stats["plan"] = plan
+
+    def top(self, limit: int = 20):
+        ranked = sorted(self.statements.values(), key=lambda stats: stats["total_ms"], reverse=True)
+        return [
+            {
+                **stats,
+                "total_ms": round(stats["total_ms"], 2),
+                "mean_ms": round(stats["total_ms"] / stats["count"], 2),
+                "max_ms": round(stats["max_ms"], 2),
+            }
+            for stats in ranked[:limit]
+        ]
+
+
+slow_query_log = SlowQueryLog()
+
+
+def explain_analyze(conn, statement: str, parameters):
+    """Re-run ``statement`` under EXPLAIN (ANALYZE, BUFFERS) on the same connection.
+
+    Uses a raw DBAPI cursor so the EXPLAIN itself bypasses these hooks, inside a
+    savepoint so a failing EXPLAIN cannot abort the caller's transaction.
+    """
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            cursor.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + statement, parameters)
+            plan = cursor.fetchone()[0]
+        except Exception:
+            cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            raise
+        cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+    finally:
+        cursor.close()
+    return json.loads(plan) if isinstance(plan, str) else plan
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration_ms = (time.perf_counter() - conn.info["query_start_time"].pop()) * 1000
+    if duration_ms < SLOW_QUERY_THRESHOLD_MS:
+        return
+
+    sql = normalize_sql(statement)
+    params = parameter_shape(parameters, executemany)
+    plan = None
+    # ANALYZE executes the query again, so only sample reads
+    if (
+        not executemany
+        and statement.lstrip().upper().startswith("SELECT")
+        and random.random() < SLOW_QUERY_EXPLAIN_SAMPLE_RATE
+    ):
+        try:
+            plan = explain_analyze(conn, statement, parameters)
+        except Exception as e:
+            logger.warning("slow_query_explain_failed", sql=sql, error=str(e))
+
+    slow_query_log.record(sql, duration_ms, params, plan)
+    logger.warning(
+        "slow_query",
+        duration_ms=round(duration_ms, 2),
+        sql=sql,
+        params=params,
+        plan=plan,
+    )
+
+
+def handle_error(exception_context):
+    # after_cursor_execute is skipped for failed statements
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start_time"):
+        conn.info["query_start_time"].pop()
+
+
+def install_slow_query_capture(engine):
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", handle_error)
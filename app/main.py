@@ -1,9 +1,17 @@
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.responses import JSONResponse
-from app.api import employees
-from app.config.logging import setup_logging
+from app.api import admin, employees
+from app.config import close_redis
+from app.config.logging import setup_logging, shutdown_logging
+from app.db.sharding import shard_router
+from app.middleware.admission import RETRY_AFTER_SECONDS
+from app.services.warmup import WARMUP_BEFORE_SERVING, WARMUP_TIMEOUT, warm_up, warmup_state
+from contextlib import asynccontextmanager, suppress
+import asyncio
+import os
 import structlog
-from prometheus_client import make_asgi_app, Counter, Histogram
+from prometheus_client import CollectorRegistry, Counter, Histogram, make_asgi_app, multiprocess
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 import time
 
 # Configure structlog JSON logging
@@ -25,10 +33,41 @@ REQUEST_LATENCY = Histogram(
 # Ensure auth dependency is available
 import app.middleware.auth
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm up in the background so /health answers while /ready reports progress
+    warmup_task = asyncio.create_task(warm_up())
+    if WARMUP_BEFORE_SERVING:
+        done, _ = await asyncio.wait({warmup_task}, timeout=WARMUP_TIMEOUT)
+        if not done:
+            logger.warning("warmup_timeout", timeout_seconds=WARMUP_TIMEOUT)
+    shard_health_task = asyncio.create_task(shard_router.monitor_health())
+    yield
+    for task in (warmup_task, shard_health_task):
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    await close_redis()
+    await shard_router.dispose()
+    logger.info("shutdown_complete")
+    shutdown_logging()
+
+
+app = FastAPI(lifespan=lifespan)
+
+
+def build_metrics_app():
+    """Serve this process's registry, or every worker's when running under gunicorn."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return make_asgi_app(registry=registry)
+    return make_asgi_app()
+
 
 # Mount Prometheus metrics endpoint
-metrics_app = make_asgi_app()
+metrics_app = build_metrics_app()
 app.mount("/metrics", metrics_app)
 
 @app.middleware("http")
@@ -64,9 +103,20 @@ async def http_exception_handler(request: Request, exc: HTTPException):
         return JSONResponse(
             status_code=exc.status_code,
             content={"detail": exc.detail or "An error occurred"},
+            headers=exc.headers,
         )
 
 
+@app.exception_handler(PoolTimeoutError)
+async def pool_timeout_handler(request: Request, exc: PoolTimeoutError):
+    logger.warning("db_pool_timeout", path=request.url.path)
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Service overloaded. Please try again later."},
+        headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+    )
+
+
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     logger.error(
@@ -80,8 +130,16 @@ async def general_exception_handler(request: Request, exc: Exception):
 
 
 app.include_router(employees.router)
+app.include_router(admin.router)
 
 
 @app.get("/health")
 def health_check():
     return {"status": "ok"}
+
+
+@app.get("/ready")
+def readiness_check():
+    if not warmup_state.ready:
+        return JSONResponse(status_code=503, content={"status": "not ready"})
+    return {"status": "ready", "warmup_seconds": round(warmup_state.duration, 3)}
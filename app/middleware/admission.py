@@ -0,0 +1,174 @@
+import asyncio
+import os
+import time
+from collections import deque
+from typing import Optional
+from fastapi import HTTPException
+from prometheus_client import Counter, Gauge, Histogram
+
+# Concurrency limits default to the DB pool capacity (pool_size + max_overflow)
+ADMISSION_INITIAL_LIMIT = int(os.getenv("ADMISSION_INITIAL_LIMIT", "20"))
+ADMISSION_MIN_LIMIT = int(os.getenv("ADMISSION_MIN_LIMIT", "2"))
+ADMISSION_MAX_LIMIT = int(os.getenv("ADMISSION_MAX_LIMIT", "30"))
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "50"))
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "0.5"))  # seconds
+ADMISSION_TARGET_LATENCY = float(os.getenv("ADMISSION_TARGET_LATENCY", "0.25"))  # seconds
+ADMISSION_BACKOFF = 0.9
+RETRY_AFTER_SECONDS = 1
+
+ADMISSION_IN_FLIGHT = Gauge(
+    "admission_in_flight", "Requests currently admitted", ["route"], multiprocess_mode="livesum"
+)
+ADMISSION_QUEUE_DEPTH = Gauge(
+    "admission_queue_depth", "Requests waiting for admission", ["route"], multiprocess_mode="livesum"
+)
+ADMISSION_LIMIT = Gauge(
+    # Each worker adapts its own limit, so keep one series per worker
+    "admission_concurrency_limit",
+    "Current adaptive concurrency limit",
+    ["route"],
+    multiprocess_mode="liveall",
+)
+ADMISSION_WAIT = Histogram(
+    "admission_queue_wait_seconds", "Time spent waiting for admission", ["route"]
+)
+ADMISSION_SHED = Counter(
+    "admission_shed_total", "Requests rejected by admission control", ["route", "reason"]
+)
+
+
+class AdmissionController:
+    """Bounded in-flight limit with a short FIFO queue and an AIMD limit.
+
+    The limit grows by roughly one per window of requests completing under
+    ``target_latency`` and shrinks multiplicatively when they complete slower,
+    at most once per window: a slow request that started before the last cut
+    already ran under the old limit and does not cut again. Routes whose
+    latency says nothing about load (streaming, password hashing) pass
+    ``target_latency=None`` and keep a fixed limit.
+    Requests that cannot be admitted within ``queue_timeout`` (or arrive when
+    the queue is full) are shed with a 503.
+    """
+
+    def __init__(
+        self,
+        route: str,
+        initial_limit: int = ADMISSION_INITIAL_LIMIT,
+        min_limit: int = ADMISSION_MIN_LIMIT,
+        max_limit: int = ADMISSION_MAX_LIMIT,
+        max_queue: int = ADMISSION_MAX_QUEUE,
+        queue_timeout: float = ADMISSION_QUEUE_TIMEOUT,
+        target_latency: Optional[float] = ADMISSION_TARGET_LATENCY,
+    ):
+        self.route = route
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.target_latency = target_latency
+        self.last_cut = float("-inf")
+        self.in_flight = 0
+        self.waiters = deque()
+        ADMISSION_LIMIT.labels(route=route).set(self.limit)
+
+    def _update_gauges(self):
+        ADMISSION_IN_FLIGHT.labels(route=self.route).set(self.in_flight)
+        ADMISSION_QUEUE_DEPTH.labels(route=self.route).set(len(self.waiters))
+        ADMISSION_LIMIT.labels(route=self.route).set(self.limit)
+
+    def _shed(self, reason: str):
+        ADMISSION_SHED.labels(route=self.route, reason=reason).inc()
+        raise HTTPException(
+            status_code=503,
+            detail="Service overloaded. Please try again later.",
+            headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+        )
+
+    async def acquire(self):
+        if self.in_flight < int(self.limit) and not self.waiters:
+            self.in_flight += 1
+            self._update_gauges()
+            ADMISSION_WAIT.labels(route=self.route).observe(0)
+            return
+        if len(self.waiters) >= self.max_queue:
+            self._shed("queue_full")
+
+        future = asyncio.get_running_loop().create_future()
+        self.waiters.append(future)
+        self._update_gauges()
+        start = time.monotonic()
+        try:
+            # A granted future means release() already counted us as in flight
+            await asyncio.wait_for(future, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._remove_waiter(future)
+            self._shed("queue_timeout")
+        except asyncio.CancelledError:
+            self._remove_waiter(future)
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+        finally:
+            ADMISSION_WAIT.labels(route=self.route).observe(time.monotonic() - start)
+
+    def release(self, latency: float = None):
+        self.in_flight -= 1
+        if latency is not None and self.target_latency is not None:
+            self._adjust_limit(latency)
+        # Hand freed capacity to queued requests in arrival order
+        while self.waiters and self.in_flight < int(self.limit):
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+        self._update_gauges()
+
+    def _adjust_limit(self, latency: float):
+        if latency > self.target_latency:
+            now = time.monotonic()
+            if now - latency >= self.last_cut:
+                self.limit = max(self.min_limit, self.limit * ADMISSION_BACKOFF)
+                self.last_cut = now
+        else:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def snapshot(self):
+        return {
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "queued": len(self.waiters),
+        }
+
+    def _remove_waiter(self, future):
+        try:
+            self.waiters.remove(future)
+        except ValueError:
+            pass
+        self._update_gauges()
+
+
+controllers = {}
+
+
+def get_admission_controller(
+    route: str, target_latency: Optional[float] = ADMISSION_TARGET_LATENCY
+) -> AdmissionController:
+    if route not in controllers:
+        controllers[route] = AdmissionController(route, target_latency=target_latency)
+    return controllers[route]
+
+
+def admission_control(route: str, target_latency: Optional[float] = ADMISSION_TARGET_LATENCY):
+    """Return a dependency that holds an admission slot for the whole request."""
+    controller = get_admission_controller(route, target_latency)
+
+    async def dependency():
+        await controller.acquire()
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            controller.release(time.monotonic() - start)
+
+    return dependency
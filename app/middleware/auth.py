@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from app.db.models import User
 from app.db.session import get_db
+import hmac
 import jwt
 import os
 
@@ -13,6 +14,8 @@ if not SECRET_KEY:
     raise RuntimeError("JWT_SECRET_KEY environment variable must be set!")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
+# Shared secret for /admin endpoints; they are disabled when unset
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -51,4 +54,13 @@ async def get_current_user(
             detail="User not found",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    return user 
\ No newline at end of file
+    return user 
+
+
+async def require_admin(x_admin_token: Optional[str] = Header(None, alias="X-Admin-Token")):
+    # Respond as if the route did not exist so it can't be discovered. Compare
+    # bytes: compare_digest rejects str with non-ASCII characters
+    if not ADMIN_TOKEN or not x_admin_token or not hmac.compare_digest(
+        x_admin_token.encode(), ADMIN_TOKEN.encode()
+    ):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
@@ -1,15 +1,34 @@
+import inspect
+import os
 import time
+import uuid
+import structlog
 from fastapi import Request, HTTPException, Depends
+from app.config import get_redis
 from app.middleware.auth import get_current_user, User
 from collections import defaultdict
 from threading import Lock
 
+logger = structlog.get_logger()
+
 RATE_LIMIT = 10  # requests
 RATE_PERIOD = 60  # seconds
+# Typeahead fires on every keystroke, so it gets its own, larger budget
+AUTOCOMPLETE_RATE_LIMIT = 120  # requests
+# Sync clients page through batches back to back
+SYNC_RATE_LIMIT = 60  # requests
+# Dashboards refresh several headcount widgets at once
+ANALYTICS_RATE_LIMIT = 60  # requests
+# Bulk exports are full-table reads, meant for nightly warehouse loads
+EXPORT_RATE_LIMIT = 10  # requests
+# "memory" keeps counters per process; "redis" shares them across workers
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
 
 # In-process thread-safe rate limiter
 class InProcessRateLimiter:
-    def __init__(self):
+    def __init__(self, limit=RATE_LIMIT, period=RATE_PERIOD):
+        self.limit = limit
+        self.period = period
         self.lock = Lock()
         self.timestamps = defaultdict(list)  # key -> list of request times
 
@@ -18,14 +37,65 @@ class InProcessRateLimiter:
         with self.lock:
             timestamps = self.timestamps[key]
             # Remove timestamps outside the window
-            while timestamps and now - timestamps[0] > RATE_PERIOD:
+            while timestamps and now - timestamps[0] > self.period:
                 timestamps.pop(0)
-            if len(timestamps) < RATE_LIMIT:
+            if len(timestamps) < self.limit:
                 timestamps.append(now)
                 return True
             return False
 
-rate_limiter_instance = InProcessRateLimiter()
+
+# Sliding window log in a sorted set, checked and updated atomically
+SLIDING_WINDOW_SCRIPT = """
+local now = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - period)
+if redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[3]) then
+    redis.call('ZADD', KEYS[1], now, ARGV[4])
+    redis.call('PEXPIRE', KEYS[1], math.ceil(period * 1000))
+    return 1
+end
+return 0
+"""
+
+
+# Redis-backed rate limiter shared by every worker process
+class RedisRateLimiter:
+    def __init__(self, name, limit=RATE_LIMIT, period=RATE_PERIOD):
+        self.name = name
+        self.limit = limit
+        self.period = period
+
+    async def is_allowed(self, key):
+        redis_conn = await get_redis()
+        try:
+            allowed = await redis_conn.eval(
+                SLIDING_WINDOW_SCRIPT,
+                1,
+                f"rate_limit:{self.name}:{key}",
+                time.time(),
+                self.period,
+                self.limit,
+                uuid.uuid4().hex,
+            )
+        except Exception as e:
+            # Fail open: an unavailable Redis should not reject every request
+            logger.warning("rate_limit_backend_error", limiter=self.name, error=str(e))
+            return True
+        return allowed == 1
+
+
+def make_rate_limiter(name, limit=RATE_LIMIT, period=RATE_PERIOD):
+    if RATE_LIMIT_BACKEND == "redis":
+        return RedisRateLimiter(name, limit, period)
+    return InProcessRateLimiter(limit, period)
+
+
+rate_limiter_instance = make_rate_limiter("search")
+autocomplete_rate_limiter_instance = make_rate_limiter("autocomplete", limit=AUTOCOMPLETE_RATE_LIMIT)
+sync_rate_limiter_instance = make_rate_limiter("sync", limit=SYNC_RATE_LIMIT)
+analytics_rate_limiter_instance = make_rate_limiter("analytics", limit=ANALYTICS_RATE_LIMIT)
+export_rate_limiter_instance = make_rate_limiter("export", limit=EXPORT_RATE_LIMIT)
 
 def get_rate_limit_key(request: Request, current_user: User = None):
     if current_user:
@@ -33,12 +103,46 @@ def get_rate_limit_key(request: Request, current_user: User = None):
     # fallback to IP
     return f"ip:{request.client.host}"
 
-async def rate_limiter(
-    request: Request,
-    current_user: User = Depends(get_current_user),
-):
+async def enforce_rate_limit(limiter, request: Request, current_user: User = None):
     key = get_rate_limit_key(request, current_user)
-    if not rate_limiter_instance.is_allowed(key):
+    allowed = limiter.is_allowed(key)
+    if inspect.isawaitable(allowed):
+        allowed = await allowed
+    if not allowed:
         raise HTTPException(
             status_code=429, detail="Rate limit exceeded. Please try again later."
         )
+
+async def rate_limiter(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+):
+    await enforce_rate_limit(rate_limiter_instance, request, current_user)
+
+
+async def autocomplete_rate_limiter(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+):
+    await enforce_rate_limit(autocomplete_rate_limiter_instance, request, current_user)
+
+
+async def sync_rate_limiter(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+):
+    await enforce_rate_limit(sync_rate_limiter_instance, request, current_user)
+
+
+async def analytics_rate_limiter(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+):
+    await enforce_rate_limit(analytics_rate_limiter_instance, request, current_user)
+
+
+async def export_rate_limiter(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+):
+    await enforce_rate_limit(export_rate_limiter_instance, request, current_user)
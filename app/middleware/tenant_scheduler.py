@@ -0,0 +1,201 @@
+import asyncio
+import math
+import os
+import time
+from collections import defaultdict, deque
+from contextlib import asynccontextmanager
+from fastapi import Depends, HTTPException
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.models import User
+from app.db.session import get_db
+from app.db.sharding import PRIMARY_SHARD, shard_router
+from app.middleware.auth import get_current_user
+
+# Concurrent tenant queries per shard. Each shard has its own pool of
+# DB_POOL_SIZE + DB_MAX_OVERFLOW (30 by default); staying below it leaves the
+# primary connections for auth lookups and health checks
+TENANT_CAPACITY = int(os.getenv("TENANT_CAPACITY", "25"))
+# Concurrent queries allowed for an org of weight 1; scaled by the org's weight
+TENANT_MAX_PER_ORG = int(os.getenv("TENANT_MAX_PER_ORG", "10"))
+TENANT_QUEUE_TIMEOUT = float(os.getenv("TENANT_QUEUE_TIMEOUT", "2"))  # seconds
+# Per-org weights, e.g. "1:4,7:0.5"; orgs not listed get weight 1
+TENANT_WEIGHTS = os.getenv("TENANT_WEIGHTS", "")
+RETRY_AFTER_SECONDS = 1
+
+TENANT_IN_FLIGHT = Gauge(
+    "tenant_db_in_flight",
+    "Tenant queries currently holding a DB slot",
+    ["org_id"],
+    multiprocess_mode="livesum",
+)
+TENANT_QUEUE_DEPTH = Gauge(
+    "tenant_db_queue_depth",
+    "Tenant queries waiting for a DB slot",
+    ["org_id"],
+    multiprocess_mode="livesum",
+)
+TENANT_WAIT = Histogram(
+    "tenant_db_wait_seconds", "Time tenant queries waited for a DB slot", ["org_id"]
+)
+TENANT_SHED = Counter(
+    "tenant_db_shed_total", "Tenant queries rejected after waiting too long", ["org_id"]
+)
+
+
+def parse_weights(value: str):
+    weights = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        org_id, weight = item.split(":")
+        weights[int(org_id)] = float(weight)
+    return weights
+
+
+class TenantScheduler:
+    """Weighted fair sharing of DB capacity across orgs.
+
+    Each org may run at most ``max_per_org * weight`` queries at once. When
+    the shared capacity is exhausted, freed slots go to the waiting org with
+    the lowest in-flight count relative to its weight, so one busy org cannot
+    starve the others.
+    """
+
+    def __init__(
+        self,
+        capacity: int = TENANT_CAPACITY,
+        max_per_org: int = TENANT_MAX_PER_ORG,
+        queue_timeout: float = TENANT_QUEUE_TIMEOUT,
+        weights: dict = None,
+    ):
+        self.capacity = capacity
+        self.max_per_org = max_per_org
+        self.queue_timeout = queue_timeout
+        self.weights = weights if weights is not None else parse_weights(TENANT_WEIGHTS)
+        self.total_in_flight = 0
+        self.in_flight = defaultdict(int)
+        self.queues = {}  # org_id -> deque of waiting futures
+
+    def weight(self, org_id: int) -> float:
+        return self.weights.get(org_id, 1.0)
+
+    def org_limit(self, org_id: int) -> int:
+        return max(1, min(self.capacity, math.ceil(self.max_per_org * self.weight(org_id))))
+
+    def _can_start(self, org_id: int) -> bool:
+        return (
+            self.total_in_flight < self.capacity
+            and self.in_flight.get(org_id, 0) < self.org_limit(org_id)
+        )
+
+    def _start(self, org_id: int):
+        self.total_in_flight += 1
+        self.in_flight[org_id] += 1
+        TENANT_IN_FLIGHT.labels(org_id=org_id).set(self.in_flight[org_id])
+
+    def _update_queue_depth(self, org_id: int):
+        TENANT_QUEUE_DEPTH.labels(org_id=org_id).set(len(self.queues.get(org_id, ())))
+
+    async def acquire(self, org_id: int):
+        if not self.queues.get(org_id) and self._can_start(org_id):
+            self._start(org_id)
+            TENANT_WAIT.labels(org_id=org_id).observe(0)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self.queues.setdefault(org_id, deque()).append(future)
+        self._update_queue_depth(org_id)
+        start = time.monotonic()
+        try:
+            await asyncio.wait_for(future, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._remove_waiter(org_id, future)
+            TENANT_SHED.labels(org_id=org_id).inc()
+            raise HTTPException(
+                status_code=503,
+                detail="Service overloaded. Please try again later.",
+                headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+            )
+        except asyncio.CancelledError:
+            self._remove_waiter(org_id, future)
+            if future.done() and not future.cancelled():
+                self.release(org_id)
+            raise
+        finally:
+            TENANT_WAIT.labels(org_id=org_id).observe(time.monotonic() - start)
+
+    def release(self, org_id: int):
+        self.total_in_flight -= 1
+        self.in_flight[org_id] -= 1
+        TENANT_IN_FLIGHT.labels(org_id=org_id).set(self.in_flight[org_id])
+        if not self.in_flight[org_id]:
+            del self.in_flight[org_id]
+        self._dispatch()
+
+    def _dispatch(self):
+        while self.total_in_flight < self.capacity:
+            eligible = [
+                org_id for org_id, queue in self.queues.items()
+                if queue and self.in_flight.get(org_id, 0) < self.org_limit(org_id)
+            ]
+            if not eligible:
+                return
+            org_id = min(eligible, key=lambda org: self.in_flight.get(org, 0) / self.weight(org))
+            future = self.queues[org_id].popleft()
+            if not self.queues[org_id]:
+                del self.queues[org_id]
+            self._update_queue_depth(org_id)
+            if not future.done():
+                self._start(org_id)
+                future.set_result(None)
+
+    def _remove_waiter(self, org_id: int, future):
+        queue = self.queues.get(org_id)
+        if queue and future in queue:
+            queue.remove(future)
+            if not queue:
+                del self.queues[org_id]
+        self._update_queue_depth(org_id)
+
+    def snapshot(self):
+        return {
+            "capacity": self.capacity,
+            "in_flight": self.total_in_flight,
+            "in_flight_by_org": dict(self.in_flight),
+            "queued_by_org": {org_id: len(queue) for org_id, queue in self.queues.items()},
+        }
+
+    @asynccontextmanager
+    async def slot(self, org_id: int):
+        await self.acquire(org_id)
+        try:
+            yield
+        finally:
+            self.release(org_id)
+
+
+# One scheduler per shard, since each shard has its own connection pool
+tenant_schedulers = {PRIMARY_SHARD: TenantScheduler()}
+
+
+def get_tenant_scheduler(shard: str) -> TenantScheduler:
+    if shard not in tenant_schedulers:
+        tenant_schedulers[shard] = TenantScheduler()
+    return tenant_schedulers[shard]
+
+
+async def get_tenant_db(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Session on the org's shard, gated by the org's fair share of that shard's pool."""
+    shard = await shard_router.shard_for(current_user.org_id, db)
+    # Return the connection used for the auth lookup while we wait for a slot
+    await db.close()
+    async with get_tenant_scheduler(shard).slot(current_user.org_id):
+        if shard == PRIMARY_SHARD:
+            yield db
+        else:
+            async with shard_router.session(shard) as shard_db:
+                yield shard_db
@@ -0,0 +1,174 @@
+import asyncio
+import os
+import sys
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+import structlog
+from sqlalchemy import distinct, func
+from sqlalchemy.future import select
+from app.db.models import Employee
+from app.db.sharding import shard_router
+
+logger = structlog.get_logger()
+
+AUTOCOMPLETE_FIELDS = ("name", "department", "position")
+# Seconds before an org's index is rebuilt even if its data version is unchanged
+AUTOCOMPLETE_TTL = int(os.getenv("AUTOCOMPLETE_TTL", "300"))
+AUTOCOMPLETE_MAX_ORGS = int(os.getenv("AUTOCOMPLETE_MAX_ORGS", "256"))
+
+
+class PrefixIndex:
+    """Sorted lowercase keys searched with bisect.
+
+    ``entries`` are ``(key, value)`` pairs; a value may be listed under several
+    keys (e.g. each word of a name) and is returned at most once per search.
+    """
+
+    def __init__(self, entries):
+        entries = sorted((key.lower(), value) for key, value in entries)
+        self.keys = [key for key, _ in entries]
+        self.values = [value for _, value in entries]
+
+    def __len__(self):
+        return len(self.keys)
+
+    def search(self, prefix: str, limit: int):
+        prefix = prefix.lower()
+        results = []
+        seen = set()
+        for i in range(bisect_left(self.keys, prefix), len(self.keys)):
+            if not self.keys[i].startswith(prefix) or len(results) >= limit:
+                break
+            value = self.values[i]
+            if value not in seen:
+                seen.add(value)
+                results.append(value)
+        return results
+
+
+class OrgAutocompleteIndex:
+    def __init__(self, version: int, rows):
+        self.version = version
+        self.built_at = time.monotonic()
+        names, departments, positions = [], set(), set()
+        for emp_id, name, department, position in rows:
+            # Match from the start of the name, as the DB fallback does
+            names.append((name, (emp_id, name)))
+            if department:
+                departments.add(department)
+            if position:
+                positions.add(position)
+        self.indexes = {
+            "name": PrefixIndex(names),
+            "department": PrefixIndex((value, value) for value in departments),
+            "position": PrefixIndex((value, value) for value in positions),
+        }
+
+    def is_fresh(self, version: int) -> bool:
+        return self.version == version and time.monotonic() - self.built_at < AUTOCOMPLETE_TTL
+
+    def search(self, field: str, prefix: str, limit: int):
+        matches = self.indexes[field].search(prefix, limit)
+        if field == "name":
+            return [{"id": emp_id, "name": name} for emp_id, name in matches]
+        return matches
+
+
+class AutocompleteCache:
+    """Per-org prefix indexes, built lazily in the background and kept LRU.
+
+    A stale index keeps serving while its replacement is built.
+    """
+
+    def __init__(self, max_orgs: int = AUTOCOMPLETE_MAX_ORGS):
+        self.max_orgs = max_orgs
+        self.indexes = OrderedDict()
+        self.building = {}  # org_id -> build task
+
+    def get(self, org_id: int, version: int):
+        index = self.indexes.get(org_id)
+        if index is None or not index.is_fresh(version):
+            self.schedule_build(org_id, version)
+        if index is not None:
+            self.indexes.move_to_end(org_id)
+        return index
+
+    def put(self, org_id: int, index: OrgAutocompleteIndex):
+        self.indexes[org_id] = index
+        self.indexes.move_to_end(org_id)
+        while len(self.indexes) > self.max_orgs:
+            self.indexes.popitem(last=False)
+
+    def snapshot(self):
+        now = time.monotonic()
+        return {
+            "orgs": {
+                org_id: {
+                    "version": index.version,
+                    "names": len(index.indexes["name"]),
+                    "age_seconds": round(now - index.built_at, 1),
+                }
+                for org_id, index in self.indexes.items()
+            },
+            "building": list(self.building),
+        }
+
+    def schedule_build(self, org_id: int, version: int):
+        if org_id not in self.building:
+            self.building[org_id] = asyncio.create_task(self._build(org_id, version))
+
+    async def _build(self, org_id: int, version: int):
+        start = time.perf_counter()
+        try:
+            async with shard_router.tenant_session(org_id) as db:
+                rows = (await db.execute(
+                    select(Employee.id, Employee.name, Employee.department, Employee.position)
+                    .where(Employee.org_id == org_id)
+                )).all()
+            # Sorting a large org takes a while; keep it off the event loop
+            index = await asyncio.to_thread(OrgAutocompleteIndex, version, rows)
+            self.put(org_id, index)
+            logger.info(
+                "autocomplete_index_built",
+                org_id=org_id,
+                rows=len(rows),
+                duration_ms=round((time.perf_counter() - start) * 1000, 2),
+            )
+        except Exception as e:
+            logger.error("autocomplete_index_build_failed", org_id=org_id, error=str(e))
+        finally:
+            self.building.pop(org_id, None)
+
+
+autocomplete_cache = AutocompleteCache()
+
+
+def _prefix_range(column, prefix: str):
+    # Range form of LIKE 'prefix%' that uses the text_pattern_ops index even
+    # with the generic plans of prepared statements
+    lowered = func.lower(column)
+    conditions = [lowered.op("~>=~")(prefix)]
+    # The last code point has no successor; bump the character before it
+    stem = prefix.rstrip(chr(sys.maxunicode))
+    if stem:
+        conditions.append(lowered.op("~<~")(stem[:-1] + chr(ord(stem[-1]) + 1)))
+    return conditions
+
+
+async def search_from_db(db, org_id: int, field: str, prefix: str, limit: int):
+    """Fallback for orgs without a built index; returns what the index would."""
+    prefix = prefix.lower()
+    column = getattr(Employee, field)
+    filters = [Employee.org_id == org_id, *_prefix_range(column, prefix)]
+    if field == "name":
+        stmt = (
+            select(Employee.id, Employee.name)
+            .where(*filters)
+            # Code point order with id as tie-breaker, like the sorted index
+            .order_by(func.lower(Employee.name).collate("C"), Employee.id)
+            .limit(limit)
+        )
+        return [{"id": emp_id, "name": name} for emp_id, name in (await db.execute(stmt)).all()]
+    stmt = select(distinct(column)).where(*filters).order_by(column).limit(limit)
+    return (await db.execute(stmt)).scalars().all()
@@ -0,0 +1,71 @@
+import base64
+import hashlib
+import os
+from array import array
+import structlog
+from app.config import get_redis
+from app.config.org_cache import get_org_data_version
+from app.db.queries import active_filters, get_bookmark_statement
+
+logger = structlog.get_logger()
+
+# A bookmark is kept for every BOOKMARK_STRIDE-th row, so reaching any page
+# costs a keyset seek plus an OFFSET of less than BOOKMARK_STRIDE rows
+BOOKMARK_STRIDE = int(os.getenv("BOOKMARK_STRIDE", "100"))
+BOOKMARK_TTL = int(os.getenv("BOOKMARK_TTL", "3600"))  # seconds
+# Upper bound of the ``page`` parameter
+MAX_PAGE = 100000
+
+
+def filter_signature(filters: dict) -> str:
+    active = active_filters(filters)
+    return hashlib.sha1(repr(active).encode()).hexdigest()[:16]
+
+
+def encode_bookmarks(ids) -> str:
+    return base64.b64encode(array("q", ids).tobytes()).decode()
+
+
+def decode_bookmarks(value: str):
+    ids = array("q")
+    ids.frombytes(base64.b64decode(value))
+    return ids
+
+
+async def get_bookmarks(db, org_id: int, filters: dict, stride: int = BOOKMARK_STRIDE):
+    """Return the ids at positions stride, 2*stride, ... of the filtered result.
+
+    The array is cached in Redis under the org's data version, so any write to
+    the org's employees makes the next lookup rebuild it.
+    """
+    version = await get_org_data_version(org_id, db)
+    cache_key = f"bookmarks:{org_id}:{version}:{stride}:{filter_signature(filters)}"
+    redis_conn = await get_redis()
+    cached = await redis_conn.get(cache_key)
+    if cached is not None:
+        return decode_bookmarks(cached)
+
+    active = active_filters(filters)
+    stmt = get_bookmark_statement(tuple(key for key, _ in active))
+    params = {"org_id": org_id, "stride": stride, **dict(active)}
+    ids = (await db.execute(stmt, params)).scalars().all()
+    await redis_conn.set(cache_key, encode_bookmarks(ids), ex=BOOKMARK_TTL)
+    logger.info("bookmarks_built", org_id=org_id, bookmarks=len(ids), stride=stride)
+    return array("q", ids)
+
+
+def page_to_cursor(bookmarks, page: int, limit: int, stride: int = BOOKMARK_STRIDE):
+    """Translate a 1-based page into a ``(cursor, offset)`` keyset position."""
+    skip = (page - 1) * limit
+    index = min(skip // stride, len(bookmarks))
+    cursor = bookmarks[index - 1] if index else None
+    # Fewer than ``stride`` rows follow the last bookmark, so a larger offset
+    # is past the end anyway; clamping keeps it a small bind value
+    return cursor, min(skip - index * stride, stride)
+
+
+async def resolve_page(db, org_id: int, page: int, limit: int, filters: dict):
+    if page == 1:
+        return None, 0
+    bookmarks = await get_bookmarks(db, org_id, filters)
+    return page_to_cursor(bookmarks, page, limit)
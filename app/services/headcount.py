@@ -0,0 +1,38 @@
+import json
+import os
+from app.config import get_redis
+from app.config.org_cache import get_org_data_version
+from app.db.queries import HEADCOUNT_DIMENSIONS, get_headcount_statement
+from app.services.bookmarks import filter_signature
+
+HEADCOUNT_TTL = int(os.getenv("HEADCOUNT_TTL", "300"))  # seconds
+
+
+async def get_headcounts(db, org_id: int, group_by: tuple, filters: dict):
+    """Return ``{"total", "groups"}`` for an org from the headcount summary table.
+
+    Results are cached in Redis under the org's data version, so any write to
+    the org's employees makes the next request read the summary table again.
+    """
+    active = tuple((key, filters[key]) for key in HEADCOUNT_DIMENSIONS if filters.get(key))
+    version = await get_org_data_version(org_id, db)
+    cache_key = f"headcount:{org_id}:{version}:{','.join(group_by)}:{filter_signature(dict(active))}"
+    redis_conn = await get_redis()
+    cached = await redis_conn.get(cache_key)
+    if cached is not None:
+        return json.loads(cached)
+
+    stmt = get_headcount_statement(group_by, tuple(key for key, _ in active))
+    rows = (await db.execute(stmt, {"org_id": org_id, **dict(active)})).all()
+    groups = [
+        {
+            # The summary table stores missing values as ''
+            **{dimension: row[i] or None for i, dimension in enumerate(group_by)},
+            "headcount": row.headcount,
+        }
+        for row in rows
+        if row.headcount
+    ]
+    result = {"total": sum(group["headcount"] for group in groups), "groups": groups}
+    await redis_conn.set(cache_key, json.dumps(result), ex=HEADCOUNT_TTL)
+    return result
@@ -0,0 +1,72 @@
+import asyncio
+from sqlalchemy import text
+from sqlalchemy.future import select
+from app.db.models import Employee, EmployeeTombstone
+
+# Every transaction that writes changes holds a shared advisory lock keyed by
+# the sequence value before its first change (claim_employee_changes()), so the
+# lowest key held by another session bounds what may still commit below it.
+PENDING_CHANGE_SEQ = text(
+    "SELECT min((classid::bigint << 32) | objid::bigint) FROM pg_locks "
+    "WHERE locktype = 'advisory' AND objsubid = 1 AND pid <> pg_backend_pid() "
+    "AND database = (SELECT oid FROM pg_database WHERE datname = current_database())"
+)
+CLAIM_CHANGES = text("SELECT claim_employee_changes()")
+
+
+async def pending_change_seq(db):
+    """Lowest change_seq an open write transaction may still commit, or None."""
+    return (await db.execute(PENDING_CHANGE_SEQ)).scalar()
+
+
+async def wait_for_pending_changes(db, poll_interval: float = 0.5):
+    """Wait until every write transaction open at the time of the call has finished."""
+    last_value = (await db.execute(text("SELECT last_value FROM employee_change_seq"))).scalar()
+    while True:
+        pending = await pending_change_seq(db)
+        if pending is None or pending > last_value:
+            return
+        await asyncio.sleep(poll_interval)
+
+
+async def fetch_changes(db, org_id: int, since: int, limit: int):
+    """Return ``(upserts, deleted_ids, next_token, has_more)`` after ``since``.
+
+    Upserts and tombstones are merged in change order and cut at ``limit``,
+    so ``next_token`` is always the sequence number of the last change returned.
+    Changes at or above a sequence number an open transaction may still commit
+    are held back, so a client never passes a change that is not visible yet.
+    """
+    pending = await pending_change_seq(db)
+    upsert_conditions = [Employee.org_id == org_id, Employee.change_seq > since]
+    tombstone_conditions = [EmployeeTombstone.org_id == org_id, EmployeeTombstone.change_seq > since]
+    if pending is not None:
+        upsert_conditions.append(Employee.change_seq < pending)
+        tombstone_conditions.append(EmployeeTombstone.change_seq < pending)
+    upserts = (await db.execute(
+        select(Employee)
+        .where(*upsert_conditions)
+        .order_by(Employee.change_seq)
+        .limit(limit)
+    )).scalars().all()
+    tombstones = (await db.execute(
+        select(EmployeeTombstone.employee_id, EmployeeTombstone.change_seq)
+        .where(*tombstone_conditions)
+        .order_by(EmployeeTombstone.change_seq)
+        .limit(limit)
+    )).all()
+
+    changes = sorted(
+        [(emp.change_seq, emp, None) for emp in upserts]
+        + [(change_seq, None, employee_id) for employee_id, change_seq in tombstones],
+        key=lambda change: change[0],
+    )
+    has_more = len(upserts) == limit or len(tombstones) == limit or len(changes) > limit
+    changes = changes[:limit]
+    next_token = changes[-1][0] if changes else since
+    return (
+        [emp for _, emp, _ in changes if emp is not None],
+        [employee_id for _, _, employee_id in changes if employee_id is not None],
+        next_token,
+        has_more,
+    )
@@ -0,0 +1,140 @@
+import asyncio
+import os
+import time
+import structlog
+from prometheus_client import Gauge
+from sqlalchemy import func, text
+from sqlalchemy.future import select
+from app.config import get_redis
+from app.config.org_cache import get_org_config
+from app.db.models import EmployeeHeadcount
+from app.db.queries import SEARCH_FILTERS, get_search_statement
+from app.db.session import AsyncSessionLocal, engine, init_db
+from app.db.sharding import PRIMARY_SHARD, shard_router
+
+logger = structlog.get_logger()
+
+# Number of pool connections opened before the service reports ready
+DB_POOL_PREWARM = int(os.getenv("DB_POOL_PREWARM", "5"))
+# Number of orgs (largest first) whose config is preloaded into the cache
+WARMUP_ORG_COUNT = int(os.getenv("WARMUP_ORG_COUNT", "20"))
+DB_INIT_ON_STARTUP = os.getenv("DB_INIT_ON_STARTUP", "false").lower() == "true"
+# Finish warm-up before the lifespan lets the server accept connections (set
+# by gunicorn.conf.py, so recycled workers never take traffic cold)
+WARMUP_BEFORE_SERVING = os.getenv("WARMUP_BEFORE_SERVING", "false").lower() == "true"
+# Past this, startup goes on and warm-up continues in the background. Keep it
+# below the gunicorn worker timeout.
+WARMUP_TIMEOUT = float(os.getenv("WARMUP_TIMEOUT", "30"))  # seconds
+
+WARMUP_DURATION = Gauge(
+    "app_warmup_duration_seconds",
+    "Time spent warming up pools and caches after startup",
+    multiprocess_mode="livemax",
+)
+# With several workers, reports 1 only once every live worker is warm
+WARMUP_READY = Gauge(
+    "app_ready", "1 once startup warm-up has completed", multiprocess_mode="livemin"
+)
+
+
+class WarmupState:
+    def __init__(self):
+        self.ready = False
+        self.duration = None
+        self.errors = []
+
+
+warmup_state = WarmupState()
+
+
+async def prewarm_pool(count: int = DB_POOL_PREWARM, db_engine=engine):
+    """Open ``count`` pool connections concurrently and return them to the pool."""
+    if count <= 0:
+        return
+    connections = await asyncio.gather(*(db_engine.connect() for _ in range(count)))
+    try:
+        await asyncio.gather(*(conn.execute(text("SELECT 1")) for conn in connections))
+    finally:
+        await asyncio.gather(*(conn.close() for conn in connections))
+
+
+async def ping_redis():
+    redis_conn = await get_redis()
+    await redis_conn.ping()
+
+
+async def get_most_active_orgs(db, count: int = WARMUP_ORG_COUNT):
+    """Largest orgs by headcount, read from the summary table.
+
+    Warm-up runs in every worker on every (re)start, so it must not aggregate
+    the whole employees table.
+    """
+    stmt = (
+        select(EmployeeHeadcount.org_id)
+        .group_by(EmployeeHeadcount.org_id)
+        .order_by(func.sum(EmployeeHeadcount.headcount).desc())
+        .limit(count)
+    )
+    return (await db.execute(stmt)).scalars().all()
+
+
+async def preload_org_configs(db, org_ids):
+    for org_id in org_ids:
+        await get_org_config(org_id, db)
+
+
+async def exercise_search_statements(db, org_id: int):
+    """Run the common search statements once so they are compiled and prepared."""
+    combinations = [()] + [(key,) for key in SEARCH_FILTERS]
+    for filter_keys in combinations:
+        for with_cursor in (False, True):
+            params = {"org_id": org_id, "limit": 1, "cursor": 0}
+            params.update({key: "" for key in filter_keys})
+            if not with_cursor:
+                params.pop("cursor")
+            await db.execute(get_search_statement(filter_keys, with_cursor), params)
+
+
+async def _run_step(name, coro):
+    start = time.perf_counter()
+    try:
+        result = await coro
+    except Exception as e:
+        warmup_state.errors.append({"step": name, "error": str(e)})
+        logger.warning("warmup_step_failed", step=name, error=str(e))
+        return None
+    logger.info("warmup_step_done", step=name, duration_ms=round((time.perf_counter() - start) * 1000, 2))
+    return result
+
+
+async def warm_up():
+    """Warm pools and caches, then mark the service ready.
+
+    Warm-up is best effort: a failing step is logged and skipped so that a
+    missing cache or slow dependency never keeps the service out of rotation.
+    """
+    start = time.perf_counter()
+    if DB_INIT_ON_STARTUP:
+        await _run_step("init_db", init_db())
+    await _run_step("ping_redis", ping_redis())
+
+    # Every shard has its own pool and prepared statements
+    for shard, shard_engine in shard_router.engines.items():
+        suffix = "" if shard == PRIMARY_SHARD else f":{shard}"
+        await _run_step("prewarm_pool" + suffix, prewarm_pool(db_engine=shard_engine))
+        session = AsyncSessionLocal() if shard == PRIMARY_SHARD else shard_router.session(shard)
+        async with session as db:
+            org_ids = await _run_step("most_active_orgs" + suffix, get_most_active_orgs(db)) or []
+            await _run_step("preload_org_configs" + suffix, preload_org_configs(db, org_ids))
+            if org_ids:
+                await _run_step("search_statements" + suffix, exercise_search_statements(db, org_ids[0]))
+
+    warmup_state.duration = time.perf_counter() - start
+    warmup_state.ready = True
+    WARMUP_DURATION.set(warmup_state.duration)
+    WARMUP_READY.set(1)
+    logger.info(
+        "warmup_complete",
+        duration_ms=round(warmup_state.duration * 1000, 2),
+        errors=len(warmup_state.errors),
+    )
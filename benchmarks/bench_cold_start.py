@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Measure time-to-first-fast-request after a (re)start of the service.
+
+Start the service, then immediately run:
+
+    python benchmarks/bench_cold_start.py --url http://localhost:8000 \\
+        --username admin_techcorp --password testpass
+
+The script reports how long /ready took to succeed, the latency of the first
+search after that, and the median latency of the following searches.
+"""
+import argparse
+import statistics
+import time
+
+import httpx
+
+
+def wait_until_ready(client, timeout):
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        try:
+            if client.get("/ready").status_code == 200:
+                return time.perf_counter() - start
+        except httpx.TransportError:
+            pass
+        time.sleep(0.05)
+    raise RuntimeError("service did not become ready")
+
+
+def timed_get(client, path, headers):
+    start = time.perf_counter()
+    response = client.get(path, headers=headers)
+    response.raise_for_status()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--username", default="admin_techcorp")
+    parser.add_argument("--password", default="testpass")
+    parser.add_argument("--org-id", type=int, default=1)
+    parser.add_argument("--requests", type=int, default=9)
+    parser.add_argument("--timeout", type=float, default=60)
+    args = parser.parse_args()
+
+    with httpx.Client(base_url=args.url) as client:
+        ready_after = wait_until_ready(client, args.timeout)
+        token = client.post(
+            "/login", json={"username": args.username, "password": args.password}
+        ).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        path = f"/hr/{args.org_id}/employees/search"
+
+        first = timed_get(client, path, headers)
+        # Stay under the per-user rate limit
+        steady = [timed_get(client, path, headers) for _ in range(args.requests - 1)]
+
+    print(f"ready after:           {ready_after * 1000:8.1f} ms")
+    print(f"first search:          {first * 1000:8.1f} ms")
+    print(f"steady-state (median): {statistics.median(steady) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark the logging overhead a request pays on the calling thread.
+
+Compares the old synchronous setup (``logging.basicConfig`` with structlog
+rendering JSON in the caller) against the queue-based pipeline from
+``app.config.logging``. A request is modelled as one ``db_session_attempt``
+event plus one distinct event, as ``get_db`` and a handler produce. Output
+goes to a local file, and to the same file behind a stream whose flushes
+block for SLOW_FLUSH seconds, as stdout does when the container log driver
+falls behind. Run from the repository root:
+
+    python benchmarks/bench_logging.py
+"""
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import structlog
+from app.config import logging as app_logging
+
+REQUESTS = 20000
+SLOW_FLUSH = 0.0001  # seconds
+
+
+class SlowStream:
+    """File wrapper whose flush blocks, like a pipe with a backed-up reader."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, data):
+        return self.stream.write(data)
+
+    def flush(self):
+        self.stream.flush()
+        time.sleep(SLOW_FLUSH)
+
+
+def setup_sync(stream):
+    # The configuration before the queue-based pipeline
+    logging.basicConfig(format="%(message)s", stream=stream, level=logging.INFO, force=True)
+    structlog.configure(
+        processors=[
+            structlog.processors.TimeStamper(fmt="iso"),
+            structlog.stdlib.add_log_level,
+            structlog.processors.StackInfoRenderer(),
+            structlog.processors.format_exc_info,
+            structlog.processors.JSONRenderer(),
+        ],
+        context_class=dict,
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        wrapper_class=structlog.stdlib.BoundLogger,
+        cache_logger_on_first_use=True,
+    )
+
+
+def run_requests(logger):
+    start = time.perf_counter()
+    for i in range(REQUESTS):
+        logger.info("db_session_attempt", attempt=1, max_retries=3)
+        logger.info("employee_search", org_id=i % 50, limit=20, results=20, request=i)
+    return time.perf_counter() - start
+
+
+def bench(label, setup, teardown=None, slow=False):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "log.jsonl")
+        with open(path, "w") as stream:
+            structlog.reset_defaults()
+            setup(SlowStream(stream) if slow else stream)
+            elapsed = run_requests(structlog.get_logger())
+            drain_start = time.perf_counter()
+            if teardown:
+                teardown()
+            drain = time.perf_counter() - drain_start
+        with open(path) as written:
+            lines = sum(1 for _ in written)
+    print(
+        f"{label:<22} {elapsed / REQUESTS * 1e6:6.1f} us/request on the caller"
+        f"  (drain {drain * 1e3:5.0f} ms, {lines} lines written)"
+    )
+
+
+def main():
+    bench("sync basicConfig", setup_sync)
+    bench("queue + sampling", app_logging.setup_logging, app_logging.shutdown_logging)
+    bench("sync, slow stdout", setup_sync, slow=True)
+    bench("queue, slow stdout", app_logging.setup_logging, app_logging.shutdown_logging, slow=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark the memory and serialization cost of employee rows held in process.
+
+Compares the projected dicts the endpoints used to build per row against
+``EmployeeRecord`` from ``app.db.records``. Rows are synthetic, with values
+decoded freshly per row as a database driver does, and categorical columns
+drawn from a few dozen distinct values. Run from the repository root:
+
+    python benchmarks/bench_records.py
+"""
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.records import RECORD_FIELDS, EmployeeRecord, dumps_records
+
+ROWS = 10000
+PAGE = 100
+FIELDS = list(RECORD_FIELDS)
+DEPARTMENTS = ["Engineering", "Marketing", "Sales", "HR", "Finance", "Support"]
+LOCATIONS = ["San Francisco", "New York", "Boston", "London", "Berlin", "Singapore"]
+POSITIONS = [f"{level} {role}" for level in ("Junior", "Senior", "Staff") for role in ("Engineer", "Manager", "Analyst")]
+
+
+def fresh(value):
+    # A new string object per row, as each fetched row decodes its own values
+    return "".join(value)
+
+
+def make_rows():
+    created = datetime(2024, 1, 1)
+    return [
+        {
+            "id": i,
+            "name": f"Employee {i}",
+            "department": fresh(DEPARTMENTS[i % len(DEPARTMENTS)]),
+            "location": fresh(LOCATIONS[i % len(LOCATIONS)]),
+            "position": fresh(POSITIONS[i % len(POSITIONS)]),
+            "contact_info": f"employee{i}@example.com",
+            "status": fresh("active" if i % 10 else "inactive"),
+            "company": fresh("Tech Corp"),
+            "created_at": created + timedelta(minutes=i),
+            "updated_at": created + timedelta(minutes=i),
+            "change_seq": i,
+            "org_id": 1,
+        }
+        for i in range(ROWS)
+    ]
+
+
+def measure(build):
+    """Memory still allocated once the source rows are gone."""
+    gc.collect()
+    tracemalloc.start()
+    rows = make_rows()
+    held = build(rows)
+    del rows
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return held, size
+
+
+def to_dicts(rows):
+    return [{field: row[field] for field in FIELDS} for row in rows]
+
+
+def to_records(rows):
+    return [EmployeeRecord(**row) for row in rows]
+
+
+def throughput(label, dump, items):
+    pages = [items[i:i + PAGE] for i in range(0, len(items), PAGE)]
+    start = time.perf_counter()
+    size = sum(len(dump(page)) for page in pages)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {len(items) / elapsed:10.0f} rows/s  ({size / 1e6:.1f} MB)")
+
+
+def dump_dicts(page):
+    # What the endpoints did: project each row to a dict, then encode
+    return json.dumps([record.project(FIELDS) for record in page], default=str).encode()
+
+
+def main():
+    dicts, dict_size = measure(to_dicts)
+    records, record_size = measure(to_records)
+    del dicts
+    print(f"{'dicts':<40} {dict_size / 1024:10.0f} KiB per {ROWS} rows")
+    print(f"{'EmployeeRecord':<40} {record_size / 1024:10.0f} KiB per {ROWS} rows")
+
+    throughput("project + json.dumps", dump_dicts, records)
+    throughput("dumps_records", lambda page: dumps_records(page, FIELDS), records)
+
+
+if __name__ == "__main__":
+    main()
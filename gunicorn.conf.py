@@ -0,0 +1,46 @@
+"""Gunicorn settings for running the service with several uvicorn workers.
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+Every worker imports the app after the fork, so each one opens its own DB and
+Redis pools and runs the startup warm-up from the FastAPI lifespan.
+"""
+import multiprocessing
+import os
+import shutil
+
+workers = int(os.getenv("WEB_CONCURRENCY", str(multiprocessing.cpu_count())))
+worker_class = "uvicorn.workers.UvicornWorker"
+bind = f"{os.getenv('API_HOST', '0.0.0.0')}:{os.getenv('API_PORT', '8000')}"
+
+# Recycle workers after a jittered number of requests so they do not all
+# restart at once; in-flight requests get graceful_timeout seconds to finish
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "10000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "1000"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+keepalive = 5
+
+# Metrics from all workers are aggregated through files in this directory. It
+# must be set before prometheus_client is imported anywhere.
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/prometheus_multiproc")
+# Each worker, including recycled ones, finishes warm-up before it accepts
+# connections; the others keep serving meanwhile
+os.environ.setdefault("WARMUP_BEFORE_SERVING", "true")
+os.environ.setdefault("WARMUP_TIMEOUT", str(min(30, timeout // 2)))
+# Per-process rate limit counters would let each worker grant the full limit
+os.environ.setdefault("RATE_LIMIT_BACKEND", "redis" if workers > 1 else "memory")
+
+from prometheus_client import multiprocess  # noqa: E402
+
+
+def on_starting(server):
+    # Files left by a previous run would be counted as live workers
+    metrics_dir = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir)
+
+
+def child_exit(server, worker):
+    # Drop live gauges of recycled or crashed workers
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,10 @@
+-- Applied after init.sql on additional shard databases (docker-compose.shards.yml)
+\c employee_search;
+
+-- init.sql provides the schema; the sample data lives on the primary only.
+-- Orgs reach a shard through "move_tenant place" or "move_tenant move".
+TRUNCATE employee_headcounts, employee_tombstones, employees, users, organizations, org_shards;
+
+-- Employee ids keep their value when a tenant moves between shards, so every
+-- shard hands out ids from its own range
+ALTER SEQUENCE employees_id_seq RESTART WITH 1000000001;
@@ -18,6 +18,9 @@ CREATE TABLE IF NOT EXISTS organizations (
     employee_fields JSON NOT NULL DEFAULT '[]'
 );
 
+-- Global change sequence for employee writes and deletes (incremental sync)
+CREATE SEQUENCE IF NOT EXISTS employee_change_seq;
+
 -- Create employees table
 CREATE TABLE IF NOT EXISTS employees (
     id SERIAL PRIMARY KEY,
@@ -30,6 +33,36 @@ CREATE TABLE IF NOT EXISTS employees (
     status VARCHAR(50),
     company VARCHAR(100),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    change_seq BIGINT NOT NULL DEFAULT nextval('employee_change_seq')
+);
+-- Databases created before incremental sync already have the table
+ALTER TABLE employees ADD COLUMN IF NOT EXISTS change_seq BIGINT NOT NULL DEFAULT nextval('employee_change_seq');
+
+-- Deleted employees, kept so sync clients can remove them
+CREATE TABLE IF NOT EXISTS employee_tombstones (
+    employee_id INTEGER PRIMARY KEY,
+    org_id INTEGER NOT NULL,
+    change_seq BIGINT NOT NULL,
+    deleted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Employee count per org, department, location and status, maintained by the
+-- employees_maintain_headcounts trigger. Missing values are stored as ''.
+CREATE TABLE IF NOT EXISTS employee_headcounts (
+    org_id INTEGER NOT NULL,
+    department VARCHAR(100) NOT NULL DEFAULT '',
+    location VARCHAR(100) NOT NULL DEFAULT '',
+    status VARCHAR(50) NOT NULL DEFAULT '',
+    headcount INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (org_id, department, location, status)
+);
+
+-- Shard directory (read on the primary). Orgs without a row are placed by
+-- consistent hashing over the configured shards.
+CREATE TABLE IF NOT EXISTS org_shards (
+    org_id INTEGER PRIMARY KEY,
+    shard VARCHAR(100) NOT NULL,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
@@ -51,6 +84,82 @@ CREATE INDEX IF NOT EXISTS idx_employees_company ON employees(company);
 CREATE INDEX IF NOT EXISTS idx_employees_department ON employees(department);
 CREATE INDEX IF NOT EXISTS idx_employees_position ON employees(position);
 CREATE INDEX IF NOT EXISTS idx_users_org_id ON users(org_id);
+-- Indexes for incremental sync
+CREATE INDEX IF NOT EXISTS idx_employees_org_change_seq ON employees(org_id, change_seq);
+CREATE INDEX IF NOT EXISTS idx_employee_tombstones_org_change_seq ON employee_tombstones(org_id, change_seq);
+-- Prefix index for name autocomplete
+CREATE INDEX IF NOT EXISTS idx_employees_org_name_prefix ON employees(org_id, lower(name) text_pattern_ops);
+
+-- Hold a shared advisory lock keyed by the current sequence value until the
+-- transaction ends, so sync can tell which change_seq values may still commit.
+-- Taken once per transaction, before its first change_seq.
+CREATE OR REPLACE FUNCTION claim_employee_changes() RETURNS void AS $$
+BEGIN
+    IF current_setting('employees.changes_claimed', true) IS DISTINCT FROM 'on' THEN
+        PERFORM pg_advisory_xact_lock_shared((SELECT last_value FROM employee_change_seq));
+        PERFORM set_config('employees.changes_claimed', 'on', true);
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Keep change_seq/updated_at current and record tombstones on delete or when an
+-- employee moves to another org. Timestamps use clock_timestamp() so they follow
+-- change_seq order.
+CREATE OR REPLACE FUNCTION employees_track_change() RETURNS trigger AS $$
+BEGIN
+    PERFORM claim_employee_changes();
+    IF TG_OP = 'DELETE' OR (TG_OP = 'UPDATE' AND OLD.org_id <> NEW.org_id) THEN
+        INSERT INTO employee_tombstones (employee_id, org_id, change_seq, deleted_at)
+        VALUES (OLD.id, OLD.org_id, nextval('employee_change_seq'), clock_timestamp())
+        ON CONFLICT (employee_id) DO UPDATE
+        SET org_id = EXCLUDED.org_id, change_seq = EXCLUDED.change_seq, deleted_at = EXCLUDED.deleted_at;
+    END IF;
+    IF TG_OP = 'DELETE' THEN
+        RETURN OLD;
+    END IF;
+    NEW.change_seq := nextval('employee_change_seq');
+    NEW.updated_at := clock_timestamp();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS employees_track_change ON employees;
+CREATE TRIGGER employees_track_change
+    BEFORE INSERT OR UPDATE OR DELETE ON employees
+    FOR EACH ROW EXECUTE FUNCTION employees_track_change();
+
+-- Move one employee between headcount rows on insert, delete, or a change of
+-- org or dimension
+CREATE OR REPLACE FUNCTION employees_maintain_headcounts() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE'
+        AND OLD.org_id = NEW.org_id
+        AND OLD.department IS NOT DISTINCT FROM NEW.department
+        AND OLD.location IS NOT DISTINCT FROM NEW.location
+        AND OLD.status IS NOT DISTINCT FROM NEW.status THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE employee_headcounts SET headcount = headcount - 1
+        WHERE org_id = OLD.org_id
+            AND department = coalesce(OLD.department, '')
+            AND location = coalesce(OLD.location, '')
+            AND status = coalesce(OLD.status, '');
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO employee_headcounts (org_id, department, location, status, headcount)
+        VALUES (NEW.org_id, coalesce(NEW.department, ''), coalesce(NEW.location, ''), coalesce(NEW.status, ''), 1)
+        ON CONFLICT (org_id, department, location, status)
+        DO UPDATE SET headcount = employee_headcounts.headcount + 1;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS employees_maintain_headcounts ON employees;
+CREATE TRIGGER employees_maintain_headcounts
+    AFTER INSERT OR UPDATE OF org_id, department, location, status OR DELETE ON employees
+    FOR EACH ROW EXECUTE FUNCTION employees_maintain_headcounts();
 
 -- Insert sample organizations data
 INSERT INTO organizations (name, employee_fields) VALUES
@@ -16,6 +16,13 @@ def event_loop():
     yield loop
     loop.close()
 
+@pytest.fixture(scope="session", autouse=True)
+def drain_logs():
+    """Write queued log records before pytest stops capturing output."""
+    yield
+    from app.config.logging import shutdown_logging
+    shutdown_logging()
+
 @pytest.fixture
 def mock_db():
     """Mock database session for testing."""
@@ -0,0 +1,37 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.middleware import auth
+
+client = TestClient(app)
+
+
+def test_debug_state_hidden_without_admin_token(monkeypatch):
+    monkeypatch.setattr(auth, "ADMIN_TOKEN", None)
+    response = client.get("/admin/debug/state", headers={"X-Admin-Token": "anything"})
+    assert response.status_code == 404
+
+
+def test_debug_state_rejects_wrong_token(monkeypatch):
+    monkeypatch.setattr(auth, "ADMIN_TOKEN", "s3cret")
+    assert client.get("/admin/debug/state").status_code == 404
+    response = client.get("/admin/debug/state", headers={"X-Admin-Token": "wrong"})
+    assert response.status_code == 404
+
+
+def test_debug_state_rejects_non_ascii_token(monkeypatch):
+    monkeypatch.setattr(auth, "ADMIN_TOKEN", "s3cret")
+    response = client.get("/admin/debug/state", headers={"X-Admin-Token": "s3cr\u00e9t".encode("latin-1")})
+    assert response.status_code == 404
+
+
+def test_debug_state_dumps_pools_and_caches(monkeypatch):
+    monkeypatch.setattr(auth, "ADMIN_TOKEN", "s3cret")
+    response = client.get("/admin/debug/state", headers={"X-Admin-Token": "s3cret"})
+    assert response.status_code == 200
+    state = response.json()
+    assert state["db_pools"]["primary"]["size"] == 10
+    assert "redis" in state
+    assert "employee_search" in state["admission"]
+    assert state["tenant_schedulers"]["primary"]["capacity"] > 0
+    assert "orgs" in state["autocomplete_cache"]
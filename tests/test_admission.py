@@ -0,0 +1,111 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+
+from app.middleware.admission import AdmissionController
+
+
+def make_controller(**kwargs):
+    options = dict(
+        initial_limit=2,
+        min_limit=1,
+        max_limit=4,
+        max_queue=2,
+        queue_timeout=0.05,
+        target_latency=0.1,
+    )
+    options.update(kwargs)
+    return AdmissionController("test", **options)
+
+
+def test_admits_up_to_limit():
+    async def scenario():
+        controller = make_controller()
+        await controller.acquire()
+        await controller.acquire()
+        assert controller.in_flight == 2
+        controller.release()
+        assert controller.in_flight == 1
+
+    asyncio.run(scenario())
+
+
+def test_sheds_when_queue_full():
+    async def scenario():
+        controller = make_controller(max_queue=0)
+        await controller.acquire()
+        await controller.acquire()
+        with pytest.raises(HTTPException) as exc:
+            await controller.acquire()
+        assert exc.value.status_code == 503
+        assert exc.value.headers["Retry-After"] == "1"
+
+    asyncio.run(scenario())
+
+
+def test_sheds_after_queue_timeout():
+    async def scenario():
+        controller = make_controller()
+        await controller.acquire()
+        await controller.acquire()
+        with pytest.raises(HTTPException) as exc:
+            await controller.acquire()
+        assert exc.value.status_code == 503
+        assert len(controller.waiters) == 0
+        assert controller.in_flight == 2
+
+    asyncio.run(scenario())
+
+
+def test_release_hands_slot_to_waiter():
+    async def scenario():
+        controller = make_controller(queue_timeout=1)
+        await controller.acquire()
+        await controller.acquire()
+        waiter = asyncio.create_task(controller.acquire())
+        await asyncio.sleep(0)
+        assert len(controller.waiters) == 1
+        controller.release()
+        await waiter
+        assert controller.in_flight == 2
+        assert len(controller.waiters) == 0
+
+    asyncio.run(scenario())
+
+
+def test_limit_adapts_to_latency():
+    controller = make_controller(initial_limit=4)
+    controller.in_flight = 1
+    controller.release(latency=1.0)
+    assert controller.limit < 4
+    slow_limit = controller.limit
+    for _ in range(10):
+        controller.in_flight = 1
+        controller.release(latency=0.01)
+    assert controller.limit > slow_limit
+    assert controller.limit <= controller.max_limit
+
+
+def test_burst_of_slow_requests_cuts_limit_once():
+    controller = make_controller(initial_limit=4)
+    # 20 requests that all started at t=9.7 and finish at t=10.0
+    with patch("app.middleware.admission.time.monotonic", return_value=10.0):
+        for _ in range(20):
+            controller.in_flight = 1
+            controller.release(latency=0.3)
+    assert controller.limit == pytest.approx(3.6)
+    # A slow request that started after the cut cuts again
+    with patch("app.middleware.admission.time.monotonic", return_value=10.5):
+        controller.in_flight = 1
+        controller.release(latency=0.3)
+    assert controller.limit == pytest.approx(3.24)
+
+
+def test_route_without_latency_target_keeps_fixed_limit():
+    controller = make_controller(initial_limit=4, target_latency=None)
+    for _ in range(5):
+        controller.in_flight = 1
+        controller.release(latency=120.0)
+    assert controller.limit == 4
@@ -6,6 +6,7 @@ from app.api.employees import list_employees
 from app.db.models import Employee, User, Organization
 from app.main import app
 import json
+from collections import namedtuple
 from unittest.mock import AsyncMock
 from app.db.session import get_db
 import bcrypt
@@ -16,6 +17,14 @@ client = TestClient(app)
 # Generate a valid bcrypt hash for "testpass"
 hashed = bcrypt.hashpw("testpass".encode(), bcrypt.gensalt()).decode()
 
+# Rows as returned by the search statement: every employee column plus total_count
+SearchRow = namedtuple("SearchRow", [*Employee.__table__.columns.keys(), "total_count"])
+
+
+def search_row(emp, total_count):
+    return SearchRow(*(getattr(emp, column) for column in Employee.__table__.columns.keys()), total_count)
+
+
 # Mock data
 mock_user = User(
     id=1,
@@ -152,6 +161,7 @@ def test_protected_endpoint_with_jwt():
     mock_result_search = MagicMock()
     mock_result_search.all.return_value = []
     mock_db_search.execute = AsyncMock(return_value=mock_result_search)
+    mock_db_search.close = AsyncMock()
 
     # Override the get_db dependency for employee search
     async def override_get_db_search():
@@ -186,7 +196,7 @@ class TestListEmployees:
             # Mock database query result
             mock_db.execute = AsyncMock()
             mock_result = MagicMock()
-            mock_result.all.return_value = [(emp, 3) for emp in mock_employees]
+            mock_result.all.return_value = [search_row(emp, 3) for emp in mock_employees]
             mock_db.execute.return_value = mock_result
 
             # Call the function
@@ -196,7 +206,9 @@ class TestListEmployees:
                 db=mock_db,
                 limit=3,
                 cursor=None,
+                page=None,
             )
+            result = json.loads(result.body)
 
             # Assertions
             assert result["limit"] == 3
@@ -226,7 +238,7 @@ class TestListEmployees:
             mock_db.execute = AsyncMock()
             mock_result = MagicMock()
             mock_result.all.return_value = [
-                (emp, 1)
+                search_row(emp, 1)
                 for emp in mock_employees
                 if emp.department == "Engineering" and emp.status == "active"
             ]
@@ -239,9 +251,11 @@ class TestListEmployees:
                 db=mock_db,
                 limit=3,
                 cursor=None,
+                page=None,
                 department="Engineering",
                 status="active",
             )
+            result = json.loads(result.body)
 
             # Assertions
             assert result["count"] == 1
@@ -259,14 +273,15 @@ class TestListEmployees:
             mock_db.execute = AsyncMock()
             mock_result = MagicMock()
             mock_result.all.return_value = [
-                (emp, 2) for emp in mock_employees[:2]
+                search_row(emp, 2) for emp in mock_employees[:2]
             ]  # First 2 employees
             mock_db.execute.return_value = mock_result
 
             # Call the function with pagination
             result = await list_employees(
-                org_id=1, current_user=mock_user, db=mock_db, limit=3, cursor=None
+                org_id=1, current_user=mock_user, db=mock_db, limit=3, cursor=None, page=None
             )
+            result = json.loads(result.body)
 
             # Assertions
             assert result["limit"] == 3
@@ -285,7 +300,7 @@ class TestListEmployees:
             # Call the function and expect HTTPException
             with pytest.raises(HTTPException) as exc_info:
                 await list_employees(
-                    org_id=1, current_user=mock_user, db=mock_db, limit=3, cursor=None
+                    org_id=1, current_user=mock_user, db=mock_db, limit=3, cursor=None, page=None
                 )
 
             assert exc_info.value.status_code == 404
@@ -302,7 +317,7 @@ class TestListEmployees:
             mock_db.execute = AsyncMock()
             mock_result = MagicMock()
             mock_result.all.return_value = [
-                (emp, 1)
+                search_row(emp, 1)
                 for emp in mock_employees
                 if emp.status == "active"
                 and emp.location == "San Francisco"
@@ -319,12 +334,14 @@ class TestListEmployees:
                 db=mock_db,
                 limit=3,
                 cursor=None,
+                page=None,
                 status="active",
                 location="San Francisco",
                 company="Tech Corp",
                 department="Engineering",
                 position="Software Engineer",
             )
+            result = json.loads(result.body)
 
             # Assertions
             assert result["limit"] == 3
@@ -350,8 +367,9 @@ class TestListEmployees:
 
             # Call the function
             result = await list_employees(
-                org_id=1, current_user=mock_user, db=mock_db, limit=3, cursor=None
+                org_id=1, current_user=mock_user, db=mock_db, limit=3, cursor=None, page=None
             )
+            result = json.loads(result.body)
 
             # Assertions
             assert result["count"] == 0
@@ -370,13 +388,14 @@ class TestListEmployees:
             # Mock database query result
             mock_db.execute = AsyncMock()
             mock_result = MagicMock()
-            mock_result.all.return_value = [(emp, 3) for emp in mock_employees]
+            mock_result.all.return_value = [search_row(emp, 3) for emp in mock_employees]
             mock_db.execute.return_value = mock_result
 
             # Call the function
             result = await list_employees(
-                org_id=1, current_user=mock_user, db=mock_db, limit=3, cursor=None
+                org_id=1, current_user=mock_user, db=mock_db, limit=3, cursor=None, page=None
             )
+            result = json.loads(result.body)
 
             # Assertions
             assert result["count"] == 3
@@ -392,6 +411,21 @@ class TestListEmployees:
                 assert "status" not in emp
                 assert "company" not in emp
 
+    @pytest.mark.asyncio
+    async def test_list_employees_returns_org_id_when_configured(self, mock_db):
+        """Any mapped column listed in the org's fields is returned, e.g. org_id"""
+        with patch("app.api.employees.get_org_config", return_value=["name", "org_id"]):
+            mock_result = MagicMock()
+            mock_result.all.return_value = [search_row(mock_employees[0], 1)]
+            mock_db.execute = AsyncMock(return_value=mock_result)
+
+            result = await list_employees(
+                org_id=1, current_user=mock_user, db=mock_db, limit=3, cursor=None, page=None
+            )
+            result = json.loads(result.body)
+
+            assert result["results"] == [{"id": 1, "name": "John Doe", "org_id": 1}]
+
     @pytest.mark.asyncio
     async def test_list_employees_org_id_mismatch(self, mock_db, mock_org_config):
         """Test 404 is raised if org_id does not match current_user.org_id"""
@@ -405,6 +439,7 @@ class TestListEmployees:
                     db=mock_db,
                     limit=3,
                     cursor=None,
+                    page=None,
                 )
             assert exc_info.value.status_code == 404
             assert exc_info.value.detail == "Organization not found"
@@ -0,0 +1,94 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from fastapi import HTTPException
+
+from app.api.employees import autocomplete_employees
+from app.db.models import Employee, User
+from app.services.autocomplete import AutocompleteCache, OrgAutocompleteIndex, PrefixIndex, _prefix_range
+
+mock_user = User(id=1, username="testuser", hashed_password="x", org_id=1)
+
+rows = [
+    (1, "John Smith", "Engineering", "Software Engineer"),
+    (2, "Jane Smithers", "Marketing", "Marketing Manager"),
+    (3, "Bob Johnson", "Engineering", "Senior Engineer"),
+]
+
+
+def test_prefix_index_search_is_case_insensitive_and_limited():
+    index = PrefixIndex([("Alpha", "a"), ("alpine", "b"), ("Beta", "c")])
+    assert index.search("AL", 10) == ["a", "b"]
+    assert index.search("al", 1) == ["a"]
+    assert index.search("z", 10) == []
+
+
+def test_org_index_matches_start_of_name():
+    index = OrgAutocompleteIndex(version=0, rows=rows)
+    assert index.search("name", "ja", 10) == [{"id": 2, "name": "Jane Smithers"}]
+    assert index.search("name", "jo", 10) == [{"id": 1, "name": "John Smith"}]
+    # Same results as the DB fallback, which uses the name prefix index
+    assert index.search("name", "smi", 10) == []
+    assert index.search("department", "eng", 10) == ["Engineering"]
+
+
+def test_prefix_range_handles_last_code_point():
+    def bounds(prefix):
+        return [condition.right.value for condition in _prefix_range(Employee.name, prefix)]
+
+    assert bounds("jo") == ["jo", "jp"]
+    assert bounds("j\U0010ffff") == ["j\U0010ffff", "k"]
+    assert bounds("\U0010ffff") == ["\U0010ffff"]
+
+
+def test_index_is_stale_after_version_change():
+    index = OrgAutocompleteIndex(version=1, rows=rows)
+    assert index.is_fresh(1)
+    assert not index.is_fresh(2)
+
+
+@pytest.mark.asyncio
+async def test_autocomplete_served_from_index():
+    cache = AutocompleteCache()
+    cache.put(1, OrgAutocompleteIndex(version=0, rows=rows))
+    db = MagicMock()
+    db.execute = AsyncMock()
+    with patch("app.api.employees.get_org_config", AsyncMock(return_value=["name", "department"])), \
+            patch("app.api.employees.get_org_data_version", AsyncMock(return_value=0)), \
+            patch("app.api.employees.autocomplete_cache", cache):
+        result = await autocomplete_employees(
+            org_id=1, q="eng", fields=["department", "position"], limit=5,
+            current_user=mock_user, db=db,
+        )
+    # position is not part of the org's directory
+    assert result["results"] == {"department": ["Engineering"]}
+    db.execute.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_autocomplete_falls_back_to_db_for_cold_org():
+    cache = MagicMock()
+    cache.get.return_value = None
+    db = MagicMock()
+    db_result = MagicMock()
+    db_result.all.return_value = [(1, "John Smith")]
+    db.execute = AsyncMock(return_value=db_result)
+    with patch("app.api.employees.get_org_config", AsyncMock(return_value=["name"])), \
+            patch("app.api.employees.get_org_data_version", AsyncMock(return_value=0)), \
+            patch("app.api.employees.autocomplete_cache", cache):
+        result = await autocomplete_employees(
+            org_id=1, q="Jo", fields=["name"], limit=5, current_user=mock_user, db=db,
+        )
+    assert result["results"] == {"name": [{"id": 1, "name": "John Smith"}]}
+    sql = str(db.execute.call_args[0][0])
+    assert "~>=~" in sql and "~<~" in sql
+
+
+@pytest.mark.asyncio
+async def test_autocomplete_rejects_unknown_field():
+    with patch("app.api.employees.get_org_config", AsyncMock(return_value=["name"])):
+        with pytest.raises(HTTPException) as exc:
+            await autocomplete_employees(
+                org_id=1, q="a", fields=["contact_info"], limit=5,
+                current_user=mock_user, db=MagicMock(),
+            )
+    assert exc.value.status_code == 400
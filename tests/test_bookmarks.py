@@ -0,0 +1,94 @@
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from fastapi import HTTPException
+
+from app.api.employees import list_employees
+from app.db.models import User
+from app.services import bookmarks
+
+mock_user = User(id=1, username="testuser", hashed_password="x", org_id=1)
+
+
+def test_encode_decode_roundtrip():
+    ids = [100, 205, 2**40]
+    assert list(bookmarks.decode_bookmarks(bookmarks.encode_bookmarks(ids))) == ids
+
+
+def test_filter_signature_ignores_unset_filters():
+    assert bookmarks.filter_signature({"status": "active", "company": None}) == \
+        bookmarks.filter_signature({"status": "active"})
+    assert bookmarks.filter_signature({"status": "active"}) != \
+        bookmarks.filter_signature({"status": "inactive"})
+
+
+def test_page_to_cursor():
+    # ids at positions 10, 20, 30
+    marks = [110, 220, 330]
+    assert bookmarks.page_to_cursor(marks, page=1, limit=5, stride=10) == (None, 0)
+    assert bookmarks.page_to_cursor(marks, page=2, limit=5, stride=10) == (None, 5)
+    assert bookmarks.page_to_cursor(marks, page=3, limit=5, stride=10) == (110, 0)
+    assert bookmarks.page_to_cursor(marks, page=6, limit=5, stride=10) == (220, 5)
+    # Past the last bookmark the offset is bounded by the rows after it
+    assert bookmarks.page_to_cursor(marks, page=9, limit=5, stride=10) == (330, 10)
+    # Pages far past the end keep the offset within int64
+    assert bookmarks.page_to_cursor(marks, page=2**62, limit=100, stride=10) == (330, 10)
+
+
+@pytest.mark.asyncio
+async def test_get_bookmarks_uses_cache_keyed_by_data_version():
+    redis_conn = AsyncMock()
+    redis_conn.get.return_value = None
+    db = MagicMock()
+    db_result = MagicMock()
+    db_result.scalars.return_value.all.return_value = [110, 220]
+    db.execute = AsyncMock(return_value=db_result)
+    with patch.object(bookmarks, "get_redis", AsyncMock(return_value=redis_conn)), \
+            patch.object(bookmarks, "get_org_data_version", AsyncMock(return_value=7)):
+        marks = await bookmarks.get_bookmarks(db, 1, {"status": "active"}, stride=10)
+
+    assert list(marks) == [110, 220]
+    assert db.execute.call_args[0][1] == {"org_id": 1, "stride": 10, "status": "active"}
+    cache_key, value = redis_conn.set.call_args[0]
+    assert cache_key.startswith("bookmarks:1:7:10:")
+    assert list(bookmarks.decode_bookmarks(value)) == [110, 220]
+
+    # A cached array is served without touching the database
+    redis_conn.get.return_value = value
+    db.execute.reset_mock()
+    with patch.object(bookmarks, "get_redis", AsyncMock(return_value=redis_conn)), \
+            patch.object(bookmarks, "get_org_data_version", AsyncMock(return_value=7)):
+        assert list(await bookmarks.get_bookmarks(db, 1, {"status": "active"}, stride=10)) == [110, 220]
+    db.execute.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_list_employees_page_uses_bookmark_cursor():
+    db = MagicMock()
+    db_result = MagicMock()
+    db_result.all.return_value = []
+    db.execute = AsyncMock(return_value=db_result)
+    with patch("app.api.employees.get_org_config", AsyncMock(return_value=["name"])), \
+            patch("app.api.employees.resolve_page", AsyncMock(return_value=(4980, 20))):
+        result = await list_employees(
+            org_id=1, current_user=mock_user, db=db, limit=20, cursor=None,
+            status=None, location=None, company=None, department=None, position=None,
+            page=250,
+        )
+        result = json.loads(result.body)
+    params = db.execute.call_args[0][1]
+    assert params["cursor"] == 4980
+    assert params["offset"] == 20
+    assert result["page"] == 250
+
+
+@pytest.mark.asyncio
+async def test_list_employees_rejects_page_with_cursor():
+    with patch("app.api.employees.get_org_config", AsyncMock(return_value=["name"])):
+        with pytest.raises(HTTPException) as exc:
+            await list_employees(
+                org_id=1, current_user=mock_user, db=MagicMock(), limit=20, cursor=10,
+                status=None, location=None, company=None, department=None, position=None,
+                page=2,
+            )
+    assert exc.value.status_code == 400
@@ -0,0 +1,112 @@
+import io
+from datetime import datetime
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+
+from app.api.employees import export_employees
+from app.db.models import User
+from app.db.queries import get_export_statement
+from app.services import export
+
+mock_user = User(id=1, username="testuser", hashed_password="x", org_id=1)
+
+ROWS = [
+    (1, "John Smith", "Engineering", datetime(2024, 1, 1)),
+    (2, "Sarah Johnson", None, datetime(2024, 1, 2)),
+    (3, "Mike Davis", "Sales", None),
+]
+COLUMNS = ("id", "name", "department", "created_at")
+
+
+def streaming_db(partitions):
+    result = MagicMock()
+
+    async def partition_iter():
+        for partition in partitions:
+            yield partition
+
+    result.partitions = partition_iter
+    db = MagicMock()
+    db.stream = AsyncMock(return_value=result)
+    return db
+
+
+async def collect(generator):
+    return b"".join([chunk async for chunk in generator])
+
+
+def test_export_columns_follow_org_fields():
+    assert export.export_columns(["name", "id", "salary", "department", "name"]) == \
+        ("id", "name", "department")
+
+
+def test_export_statement_selects_only_projected_columns():
+    sql = str(get_export_statement(("id", "name"), ("status",)).compile(dialect=postgresql.dialect()))
+    assert sql.startswith("SELECT employees.id, employees.name \nFROM employees")
+    assert "employees.status = %(status)s" in sql
+    assert "contact_info" not in sql
+
+
+@pytest.mark.asyncio
+async def test_arrow_stream_roundtrip_in_batches():
+    db = streaming_db([ROWS[:2], ROWS[2:]])
+    data = await collect(export.stream_export(db, 1, COLUMNS, {"status": "active"}, "arrow", batch_size=2))
+
+    reader = pa.ipc.open_stream(data)
+    batches = list(reader)
+    assert [batch.num_rows for batch in batches] == [2, 1]
+    table = pa.Table.from_batches(batches)
+    assert table.column_names == list(COLUMNS)
+    assert table.schema.field("id").type == pa.int32()
+    assert table.column("department").to_pylist() == ["Engineering", None, "Sales"]
+    stmt, params = db.stream.call_args[0]
+    assert params == {"org_id": 1, "status": "active"}
+    assert stmt.get_execution_options()["yield_per"] == 2
+
+
+@pytest.mark.asyncio
+async def test_parquet_export_writes_one_row_group_per_batch():
+    db = streaming_db([ROWS[:2], ROWS[2:]])
+    data = await collect(export.stream_export(db, 1, COLUMNS, {}, "parquet", batch_size=2))
+
+    parquet_file = pq.ParquetFile(io.BytesIO(data))
+    assert parquet_file.metadata.num_row_groups == 2
+    table = parquet_file.read()
+    assert table.column("name").to_pylist() == ["John Smith", "Sarah Johnson", "Mike Davis"]
+    assert table.column("created_at").to_pylist()[2] is None
+
+
+@pytest.mark.asyncio
+async def test_empty_export_is_still_a_valid_file():
+    data = await collect(export.stream_export(streaming_db([]), 1, COLUMNS, {}, "parquet"))
+    assert pq.ParquetFile(io.BytesIO(data)).metadata.num_rows == 0
+
+
+@pytest.mark.asyncio
+async def test_export_endpoint_streams_org_projection():
+    db = streaming_db([[(1, "John Smith")]])
+    with patch("app.api.employees.get_org_config", AsyncMock(return_value=["name"])):
+        response = await export_employees(
+            org_id=1, fmt="arrow", status=None, location=None, company=None, department=None,
+            position=None, current_user=mock_user, db=db,
+        )
+    assert response.media_type == "application/vnd.apache.arrow.stream"
+    assert 'filename="employees-1.arrows"' in response.headers["content-disposition"]
+    data = await collect(response.body_iterator)
+    assert pa.ipc.open_stream(data).read_all().to_pylist() == [{"id": 1, "name": "John Smith"}]
+
+
+@pytest.mark.asyncio
+async def test_export_endpoint_rejects_unknown_format():
+    with patch("app.api.employees.get_org_config", AsyncMock(return_value=["name"])):
+        with pytest.raises(HTTPException) as exc:
+            await export_employees(
+                org_id=1, fmt="csv", status=None, location=None, company=None, department=None,
+                position=None, current_user=mock_user, db=MagicMock(),
+            )
+    assert exc.value.status_code == 400
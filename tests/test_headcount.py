@@ -0,0 +1,94 @@
+import json
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+
+from app.api.employees import headcount_analytics
+from app.db.models import User
+from app.db.queries import get_headcount_statement
+from app.services import headcount
+
+mock_user = User(id=1, username="testuser", hashed_password="x", org_id=1)
+
+
+def row(headcount_value, *values):
+    result = MagicMock()
+    result.__getitem__.side_effect = lambda i: values[i]
+    result.headcount = headcount_value
+    return result
+
+
+def test_headcount_statement_groups_only_requested_dimensions():
+    sql = str(get_headcount_statement(("department",), ("status",)).compile(dialect=postgresql.dialect()))
+    assert "FROM employee_headcounts" in sql
+    assert "GROUP BY employee_headcounts.department" in sql
+    assert "employee_headcounts.status = %(status)s" in sql
+    assert "location" not in sql
+    assert get_headcount_statement(("department",), ("status",)) is \
+        get_headcount_statement(("department",), ("status",))
+
+
+@pytest.mark.asyncio
+async def test_get_headcounts_reads_summary_and_caches_by_version():
+    redis_conn = AsyncMock()
+    redis_conn.get.return_value = None
+    db = MagicMock()
+    db_result = MagicMock()
+    db_result.all.return_value = [row(3, "Engineering", ""), row(2, "HR", "Boston"), row(0, "Sales", "Austin")]
+    db.execute = AsyncMock(return_value=db_result)
+    with patch.object(headcount, "get_redis", AsyncMock(return_value=redis_conn)), \
+            patch.object(headcount, "get_org_data_version", AsyncMock(return_value=9)):
+        result = await headcount.get_headcounts(
+            db, 1, ("department", "location"), {"status": "active", "location": None}
+        )
+
+    assert result == {
+        "total": 5,
+        "groups": [
+            {"department": "Engineering", "location": None, "headcount": 3},
+            {"department": "HR", "location": "Boston", "headcount": 2},
+        ],
+    }
+    assert db.execute.call_args[0][1] == {"org_id": 1, "status": "active"}
+    cache_key, value = redis_conn.set.call_args[0]
+    assert cache_key.startswith("headcount:1:9:department,location:")
+    assert json.loads(value) == result
+
+
+@pytest.mark.asyncio
+async def test_get_headcounts_serves_cached_result():
+    redis_conn = AsyncMock()
+    redis_conn.get.return_value = json.dumps({"total": 4, "groups": [{"headcount": 4}]})
+    db = MagicMock()
+    db.execute = AsyncMock()
+    with patch.object(headcount, "get_redis", AsyncMock(return_value=redis_conn)), \
+            patch.object(headcount, "get_org_data_version", AsyncMock(return_value=9)):
+        result = await headcount.get_headcounts(db, 1, (), {})
+    assert result["total"] == 4
+    db.execute.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_headcount_endpoint_limits_group_by_to_org_fields():
+    get_headcounts = AsyncMock(return_value={"total": 1, "groups": []})
+    with patch("app.api.employees.get_org_config", AsyncMock(return_value=["name", "status", "department"])), \
+            patch("app.api.employees.get_headcounts", get_headcounts):
+        result = await headcount_analytics(
+            org_id=1, group_by=["status", "location", "department"], status=None, location=None,
+            department="HR", current_user=mock_user, db=MagicMock(),
+        )
+    assert result["group_by"] == ["department", "status"]
+    assert get_headcounts.call_args[0][2] == ("department", "status")
+
+
+@pytest.mark.asyncio
+async def test_headcount_endpoint_rejects_unknown_dimension():
+    with patch("app.api.employees.get_org_config", AsyncMock(return_value=["name", "status"])):
+        with pytest.raises(HTTPException) as exc:
+            await headcount_analytics(
+                org_id=1, group_by=["salary"], status=None, location=None, department=None,
+                current_user=mock_user, db=MagicMock(),
+            )
+    assert exc.value.status_code == 400
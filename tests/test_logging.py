@@ -0,0 +1,96 @@
+import io
+import logging
+import json
+from unittest.mock import patch
+
+import pytest
+import structlog
+
+from app.config import logging as app_logging
+
+
+def test_parse_sample_rates():
+    assert app_logging.parse_sample_rates("db_session_attempt=0.01, slow_query=1") == \
+        {"db_session_attempt": 0.01, "slow_query": 1.0}
+    assert app_logging.parse_sample_rates("") == {}
+
+
+def test_sampler_drops_unsampled_info_but_keeps_errors():
+    sampler = app_logging.EventSampler({"noisy": 0.1})
+    event = {"event": "noisy"}
+    with patch("app.config.logging.random.random", return_value=0.5):
+        with pytest.raises(structlog.DropEvent):
+            sampler(None, "info", event)
+        assert sampler(None, "error", event) is event
+    with patch("app.config.logging.random.random", return_value=0.05):
+        assert sampler(None, "info", event) is event
+    assert sampler(None, "info", {"event": "other"}) == {"event": "other"}
+
+
+def test_duplicate_suppressor_limits_identical_events_per_window():
+    suppressor = app_logging.DuplicateSuppressor(window=10, max_per_window=2)
+    with patch("app.config.logging.time.monotonic", return_value=0):
+        suppressor(None, "info", {"event": "retry", "attempt": 1})
+        suppressor(None, "info", {"event": "retry", "attempt": 1})
+        for _ in range(3):
+            with pytest.raises(structlog.DropEvent):
+                suppressor(None, "info", {"event": "retry", "attempt": 1})
+        # Different fields are a different event
+        suppressor(None, "info", {"event": "retry", "attempt": 2})
+    with patch("app.config.logging.time.monotonic", return_value=11):
+        assert suppressor(None, "info", {"event": "retry", "attempt": 1}) == \
+            {"event": "retry", "attempt": 1, "suppressed": 3}
+
+
+def test_duplicate_suppressor_is_bounded():
+    suppressor = app_logging.DuplicateSuppressor(window=10, max_per_window=1, max_keys=2)
+    for i in range(5):
+        suppressor(None, "info", {"event": "request", "id": i})
+    assert len(suppressor.seen) == 2
+
+
+def test_queue_handler_drops_when_full():
+    handler = app_logging.DeferredFormattingQueueHandler(app_logging.queue.Queue(1))
+    record = logging.makeLogRecord({"msg": {"event": "x"}})
+    handler.enqueue(record)
+    handler.enqueue(record)
+    assert handler.dropped == 1
+
+
+def test_writer_renders_structlog_and_stdlib_records_as_json():
+    log_queue = app_logging.queue.Queue()
+    stream = io.StringIO()
+    output = app_logging.BatchStreamHandler(stream)
+    output.setFormatter(structlog.stdlib.ProcessorFormatter(
+        processors=[
+            structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+            structlog.processors.JSONRenderer(),
+        ],
+        foreign_pre_chain=[structlog.stdlib.add_log_level],
+    ))
+    handler = app_logging.DeferredFormattingQueueHandler(log_queue)
+    handler.handle(logging.makeLogRecord({
+        "msg": {"event": "employee_search", "org_id": 1},
+        "levelno": 20, "levelname": "INFO", "_logger": None, "_name": "info",
+    }))
+    handler.handle(logging.makeLogRecord({
+        "msg": "started %s", "args": ("uvicorn",), "levelno": 20, "levelname": "INFO",
+    }))
+
+    app_logging.BackgroundLogWriter(log_queue, output).drain()
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert lines[0] == {"event": "employee_search", "org_id": 1}
+    assert lines[1]["event"] == "started uvicorn"
+
+
+def test_batch_handler_writes_to_current_stdout():
+    handler = app_logging.BatchStreamHandler()
+    replaced, current = io.StringIO(), io.StringIO()
+    with patch("sys.stdout", replaced):
+        assert handler.stream is replaced
+    replaced.close()
+    with patch("sys.stdout", current):
+        handler.emit(logging.makeLogRecord({"msg": "after capture"}))
+        handler.flush()
+    assert current.getvalue() == "after capture\n"
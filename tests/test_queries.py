@@ -0,0 +1,56 @@
+from sqlalchemy.dialects import postgresql
+
+from app.db.models import Employee
+from app.db.queries import build_search_query, get_bookmark_statement
+
+
+def test_same_filter_combination_reuses_statement():
+    stmt1, params1 = build_search_query(1, 20, None, status="active")
+    stmt2, params2 = build_search_query(2, 50, None, status="inactive")
+    assert stmt1 is stmt2
+    assert params1 == {"org_id": 1, "limit": 20, "status": "active"}
+    assert params2 == {"org_id": 2, "limit": 50, "status": "inactive"}
+
+
+def test_different_filter_combinations_use_different_statements():
+    stmt1, _ = build_search_query(1, 20, None, status="active")
+    stmt2, _ = build_search_query(1, 20, None, department="Engineering")
+    stmt3, params3 = build_search_query(1, 20, 10, status="active")
+    assert stmt1 is not stmt2
+    assert stmt1 is not stmt3
+    assert params3["cursor"] == 10
+
+
+def test_filter_order_does_not_change_statement():
+    stmt1, _ = build_search_query(1, 20, None, status="active", location="NYC")
+    stmt2, _ = build_search_query(1, 20, None, location="NYC", status="active")
+    assert stmt1 is stmt2
+
+
+def test_statement_uses_bind_parameters_only():
+    stmt, _ = build_search_query(1, 20, 5, company="Tech Corp")
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "Tech Corp" not in sql
+    assert "%(company)s" in sql
+    assert "%(cursor)s" in sql
+    assert "%(limit)s" in sql
+
+
+def test_search_selects_columns_not_entities():
+    stmt, _ = build_search_query(1, 20, None)
+    assert list(stmt.selected_columns.keys()) == [*Employee.__table__.columns.keys(), "total_count"]
+    assert Employee not in [description["type"] for description in stmt.column_descriptions]
+
+
+def test_offset_uses_separate_statement():
+    stmt1, _ = build_search_query(1, 20, 5, None, status="active")
+    stmt2, params2 = build_search_query(1, 20, 5, 40, status="active")
+    assert stmt1 is not stmt2
+    assert params2["offset"] == 40
+    assert "OFFSET" in str(stmt2.compile(dialect=postgresql.dialect()))
+
+
+def test_bookmark_statement_numbers_rows_once():
+    sql = str(get_bookmark_statement(("status",)).compile(dialect=postgresql.dialect()))
+    assert "row_number() OVER (ORDER BY employees.id)" in sql
+    assert "%(stride)s" in sql
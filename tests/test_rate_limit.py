@@ -1,4 +1,5 @@
 import asyncio
+from unittest.mock import AsyncMock, patch
 
 import pytest
 from fastapi import HTTPException
@@ -67,3 +68,42 @@ def test_rate_limiter_blocks(monkeypatch):
         asyncio.run(rate_limit.rate_limiter(request, user))
     assert exc.value.status_code == 429
     assert "Rate limit exceeded" in exc.value.detail
+
+
+def test_redis_rate_limiter_uses_shared_key():
+    redis_conn = AsyncMock()
+    redis_conn.eval.return_value = 1
+    limiter = rate_limit.RedisRateLimiter("search", limit=5, period=60)
+    with patch("app.middleware.rate_limit.get_redis", AsyncMock(return_value=redis_conn)):
+        assert asyncio.run(limiter.is_allowed("user:1"))
+        redis_conn.eval.return_value = 0
+        assert not asyncio.run(limiter.is_allowed("user:1"))
+    args = redis_conn.eval.call_args.args
+    assert args[1:3] == (1, "rate_limit:search:user:1")
+    assert args[4:6] == (60, 5)
+
+
+def test_redis_rate_limiter_fails_open():
+    redis_conn = AsyncMock()
+    redis_conn.eval.side_effect = ConnectionError("redis down")
+    limiter = rate_limit.RedisRateLimiter("search")
+    with patch("app.middleware.rate_limit.get_redis", AsyncMock(return_value=redis_conn)):
+        assert asyncio.run(limiter.is_allowed("user:1"))
+
+
+def test_rate_limiter_awaits_async_backend(monkeypatch):
+    request = DummyRequest('10.0.0.3')
+    user = DummyUser(3)
+    monkeypatch.setattr(rate_limit.rate_limiter_instance, 'is_allowed', AsyncMock(return_value=False))
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(rate_limit.rate_limiter(request, user))
+    assert exc.value.status_code == 429
+
+
+def test_make_rate_limiter_selects_backend(monkeypatch):
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_BACKEND", "redis")
+    assert isinstance(rate_limit.make_rate_limiter("sync", limit=3), rate_limit.RedisRateLimiter)
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_BACKEND", "memory")
+    limiter = rate_limit.make_rate_limiter("sync", limit=3)
+    assert isinstance(limiter, rate_limit.InProcessRateLimiter)
+    assert limiter.limit == 3
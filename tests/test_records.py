@@ -0,0 +1,68 @@
+import json
+from datetime import datetime
+
+from app.db.models import Employee
+from app.db.records import EmployeeRecord, dumps_records, dumps_response, record_fields
+
+FIELDS = ["id", "name", "department", "status", "created_at", "salary", "name"]
+
+
+def make_record(emp_id, department="Engineering"):
+    # join() builds a new string object per call, like values decoded from a row
+    return EmployeeRecord.from_row(Employee(
+        id=emp_id, org_id=1, name=f"Employee {emp_id}", department="".join(department),
+        status="active", created_at=datetime(2024, 1, emp_id),
+    ))
+
+
+def test_record_has_no_instance_dict():
+    record = make_record(1)
+    assert not hasattr(record, "__dict__")
+    assert record.location is None
+
+
+def test_categorical_values_are_shared():
+    first, second = make_record(1), make_record(2)
+    assert first.department is second.department
+    assert first.status is second.status
+
+
+def test_project_keeps_configured_order_and_skips_unknown_fields():
+    assert make_record(1).project(FIELDS) == {
+        "id": 1,
+        "name": "Employee 1",
+        "department": "Engineering",
+        "status": "active",
+        "created_at": datetime(2024, 1, 1),
+    }
+    assert record_fields(FIELDS) == ("name", "department", "status", "created_at")
+
+
+def test_dumps_records_matches_json_of_projection():
+    records = [make_record(1), make_record(2, department='R&D "Labs" – Zürich'), EmployeeRecord(id=3, name="Ann")]
+    expected = [
+        {**record.project(FIELDS), **({"created_at": record.created_at.isoformat()} if record.created_at else {})}
+        for record in records
+    ]
+    assert json.loads(dumps_records(records, FIELDS)) == expected
+    assert dumps_records([], FIELDS) == b"[]"
+
+
+def test_any_mapped_column_can_be_exposed():
+    # TechCorp's sample config lists org_id
+    fields = ["name", "department", "org_id", "updated_at"]
+    record = EmployeeRecord.from_row(Employee(
+        id=1, org_id=1, name="A", department="Eng", updated_at=datetime(2024, 2, 1),
+    ))
+    assert record.project(fields) == {
+        "id": 1, "name": "A", "department": "Eng", "org_id": 1, "updated_at": datetime(2024, 2, 1),
+    }
+    assert json.loads(dumps_records([record], fields)) == [
+        {"id": 1, "name": "A", "department": "Eng", "org_id": 1, "updated_at": "2024-02-01T00:00:00"},
+    ]
+
+
+def test_dumps_response_appends_records_to_payload():
+    body = dumps_response({"count": 1, "next_cursor": None}, "results", [make_record(1)], ["name"])
+    assert json.loads(body) == {"count": 1, "next_cursor": None, "results": [{"id": 1, "name": "Employee 1"}]}
+    assert json.loads(dumps_response({}, "results", [], ["name"])) == {"results": []}
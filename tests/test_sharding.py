@@ -0,0 +1,224 @@
+import asyncio
+from collections import Counter
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.db import move_tenant, sharding
+from app.db.models import Employee, User
+from app.middleware import tenant_scheduler
+from app.middleware.tenant_scheduler import get_tenant_db
+
+
+def make_router(*names, ttl=30):
+    return sharding.ShardRouter({name: MagicMock() for name in names}, directory_ttl=ttl)
+
+
+def directory_db(shard):
+    db = MagicMock()
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = shard
+    db.execute = AsyncMock(return_value=result)
+    return db
+
+
+def test_parse_shard_urls():
+    assert sharding.parse_shard_urls("shard1=postgresql://a/db?x=1, shard2=postgresql://b/db") == {
+        "shard1": "postgresql://a/db?x=1",
+        "shard2": "postgresql://b/db",
+    }
+    assert sharding.parse_shard_urls("") == {}
+
+
+def test_hash_ring_spreads_orgs_and_adding_a_shard_moves_few():
+    before = sharding.HashRing(["primary", "shard1"])
+    after = sharding.HashRing(["primary", "shard1", "shard2"])
+    placement = Counter(before.get(org_id) for org_id in range(3000))
+    assert min(placement.values()) > 1000
+    moved = sum(before.get(org_id) != after.get(org_id) for org_id in range(3000))
+    # Only orgs that land on the new shard move, about a third of them
+    assert moved < 1500
+    assert all(after.get(org_id) == "shard2" for org_id in range(3000) if before.get(org_id) != after.get(org_id))
+
+
+def test_single_shard_never_reads_directory():
+    router = make_router("primary")
+    db = directory_db("shard1")
+    assert asyncio.run(router.shard_for(7, db)) == "primary"
+    db.execute.assert_not_called()
+
+
+def test_directory_entry_wins_and_is_cached():
+    router = make_router("primary", "shard1", "shard2")
+    db = directory_db("shard2")
+    assert asyncio.run(router.shard_for(7, db)) == "shard2"
+    assert asyncio.run(router.shard_for(7, db)) == "shard2"
+    assert db.execute.await_count == 1
+    router.forget(7)
+    asyncio.run(router.shard_for(7, db))
+    assert db.execute.await_count == 2
+
+
+def test_unknown_or_missing_directory_entry_stays_on_primary():
+    router = make_router("primary", "shard1", ttl=0)
+    org_id = next(org_id for org_id in range(100) if router.placement(org_id) == "shard1")
+    assert asyncio.run(router.shard_for(org_id, directory_db(None))) == "primary"
+    assert asyncio.run(router.shard_for(org_id, directory_db("retired"))) == "primary"
+
+
+def test_check_health_marks_failing_shard_down():
+    router = make_router("primary")
+    router.engines["primary"].connect.side_effect = OSError("connection refused")
+    asyncio.run(router.check_health())
+    assert sharding.SHARD_UP.labels(shard="primary")._value.get() == 0
+
+
+@pytest.mark.asyncio
+async def test_tenant_db_uses_shard_session():
+    user = User(id=1, username="u", hashed_password="x", org_id=7)
+    auth_db = MagicMock()
+    auth_db.close = AsyncMock()
+    shard_db = MagicMock()
+    router = MagicMock()
+    router.shard_for = AsyncMock(return_value="shard1")
+    router.session.return_value.__aenter__ = AsyncMock(return_value=shard_db)
+    router.session.return_value.__aexit__ = AsyncMock(return_value=None)
+    with patch("app.middleware.tenant_scheduler.shard_router", router):
+        dependency = get_tenant_db(current_user=user, db=auth_db)
+        assert await dependency.__anext__() is shard_db
+        await dependency.aclose()
+    auth_db.close.assert_awaited_once()
+    router.session.assert_called_once_with("shard1")
+
+
+@pytest.mark.asyncio
+async def test_tenant_db_schedules_each_shard_separately():
+    user = User(id=1, username="u", hashed_password="x", org_id=7)
+    auth_db = MagicMock()
+    auth_db.close = AsyncMock()
+    router = MagicMock()
+    router.shard_for = AsyncMock(return_value="shard1")
+    schedulers = {"primary": tenant_scheduler.TenantScheduler()}
+    with patch("app.middleware.tenant_scheduler.shard_router", router), \
+            patch.object(tenant_scheduler, "tenant_schedulers", schedulers):
+        dependency = get_tenant_db(current_user=user, db=auth_db)
+        await dependency.__anext__()
+        assert schedulers["shard1"].in_flight == {7: 1}
+        assert schedulers["primary"].total_in_flight == 0
+        await dependency.aclose()
+    assert schedulers["shard1"].total_in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_copy_batch_refuses_to_overwrite_other_orgs():
+    target = MagicMock()
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = [1]
+    target.execute = AsyncMock(return_value=result)
+    upserts = [Employee(id=1, org_id=7, name="A"), Employee(id=2, org_id=7, name="B")]
+    with pytest.raises(move_tenant.MoveError, match=r"\[2\]"):
+        await move_tenant.copy_batch(target, 7, upserts, [])
+
+
+@pytest.mark.asyncio
+async def test_catch_up_copies_until_feed_is_drained():
+    batches = [([Employee(id=1, org_id=7, name="A")], [5], 10, True), ([], [], 10, False)]
+    session = MagicMock()
+    session.__aenter__ = AsyncMock(return_value=session)
+    session.__aexit__ = AsyncMock(return_value=None)
+    session.commit = AsyncMock()
+    router = MagicMock()
+    router.session.return_value = session
+    with patch.object(move_tenant, "shard_router", router), \
+            patch.object(move_tenant, "fetch_changes", AsyncMock(side_effect=batches)) as fetch, \
+            patch.object(move_tenant, "copy_batch", AsyncMock()) as copy:
+        token = await move_tenant.catch_up(7, "primary", "shard1")
+    assert token == 10
+    assert [call.args[2] for call in fetch.await_args_list] == [0, 10]
+    copy.assert_awaited_once()
+
+
+def shard_session(*results):
+    session = MagicMock()
+    session.__aenter__ = AsyncMock(return_value=session)
+    session.__aexit__ = AsyncMock(return_value=None)
+    session.execute = AsyncMock(side_effect=[MagicMock(scalar=MagicMock(return_value=value)) for value in results])
+    session.commit = AsyncMock()
+    return session
+
+
+@pytest.mark.asyncio
+async def test_restamp_renumbers_org_changes_above_source_sequence():
+    # Other orgs advanced the source's sequence to 900 during the move
+    source, target = shard_session(900), shard_session(None, None, None, None)
+    router = MagicMock()
+    router.session.side_effect = lambda shard: {"primary": source, "shard1": target}[shard]
+    with patch.object(move_tenant, "shard_router", router):
+        await move_tenant.restamp_target(7, "primary", "shard1")
+
+    setval, claim, employees, tombstones = [call.args for call in target.execute.await_args_list]
+    assert "setval('employee_change_seq'" in str(setval[0]) and setval[1] == {"seq": 900}
+    assert str(claim[0]) == "SELECT claim_employee_changes()"
+    employees_sql = str(employees[0])
+    assert employees_sql.startswith("UPDATE employees SET id=employees.id")
+    assert "employees.org_id = :org_id_1" in employees_sql
+    tombstones_sql = str(tombstones[0])
+    assert "change_seq=nextval(:nextval_1)" in tombstones_sql
+    assert "employee_tombstones.org_id = :org_id_1" in tombstones_sql
+    target.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_move_restamps_after_final_catch_up():
+    calls = []
+
+    def step(name):
+        return AsyncMock(side_effect=lambda *args, **kwargs: calls.append(name))
+
+    router = MagicMock(engines={"primary": None, "shard1": None})
+    router.shard_for = AsyncMock(return_value="primary")
+    session = MagicMock()
+    session.__aenter__ = AsyncMock(return_value=session)
+    session.__aexit__ = AsyncMock(return_value=None)
+    with patch.object(move_tenant, "shard_router", router), \
+            patch.object(move_tenant, "AsyncSessionLocal", return_value=session), \
+            patch.object(move_tenant, "prepare_target", step("prepare")), \
+            patch.object(move_tenant, "catch_up", step("catch_up")), \
+            patch.object(move_tenant, "advance_id_sequence", step("ids")), \
+            patch.object(move_tenant, "set_route", step("route")), \
+            patch.object(move_tenant, "wait_for_pending_changes", step("wait")), \
+            patch.object(move_tenant, "restamp_target", step("restamp")), \
+            patch.object(move_tenant, "invalidate_org_data_version", AsyncMock()), \
+            patch.object(move_tenant.asyncio, "sleep", AsyncMock()):
+        await move_tenant.move_tenant(7, "shard1")
+    assert calls == ["prepare", "catch_up", "ids", "route", "wait", "catch_up", "ids", "restamp"]
+
+
+@pytest.mark.asyncio
+async def test_place_org_records_ring_choice():
+    primary = shard_session()
+    primary.execute = AsyncMock(side_effect=[
+        MagicMock(scalar_one_or_none=MagicMock(return_value=None)),
+        MagicMock(scalar=MagicMock(return_value=0)),
+    ])
+    router = MagicMock()
+    router.placement.return_value = "shard1"
+    with patch.object(move_tenant, "shard_router", router), \
+            patch.object(move_tenant, "AsyncSessionLocal", return_value=primary), \
+            patch.object(move_tenant, "prepare_target", AsyncMock()) as prepare, \
+            patch.object(move_tenant, "set_route", AsyncMock()) as set_route:
+        assert await move_tenant.place_org(11) == "shard1"
+    prepare.assert_awaited_once_with(11, "primary", "shard1", purge_target=False)
+    set_route.assert_awaited_once_with(11, "shard1")
+
+
+@pytest.mark.asyncio
+async def test_place_org_refuses_orgs_with_data():
+    primary = shard_session()
+    primary.execute = AsyncMock(side_effect=[
+        MagicMock(scalar_one_or_none=MagicMock(return_value=None)),
+        MagicMock(scalar=MagicMock(return_value=3)),
+    ])
+    with patch.object(move_tenant, "AsyncSessionLocal", return_value=primary):
+        with pytest.raises(move_tenant.MoveError, match="use move"):
+            await move_tenant.place_org(1)
@@ -0,0 +1,79 @@
+from unittest.mock import MagicMock
+
+from fastapi.testclient import TestClient
+
+from app.db import slow_queries
+from app.main import app
+from app.middleware import auth
+
+
+def test_normalize_sql_collapses_whitespace_and_literals():
+    sql = "SELECT *\n  FROM employees\n WHERE org_id = $1 AND name = 'bob' LIMIT 10"
+    assert slow_queries.normalize_sql(sql) == \
+        "SELECT * FROM employees WHERE org_id = $1 AND name = ? LIMIT ?"
+
+
+def test_parameter_shape_hides_values():
+    assert slow_queries.parameter_shape((1, "secret")) == ["int", "str"]
+    assert slow_queries.parameter_shape({"org_id": 1}) == {"org_id": "int"}
+    assert slow_queries.parameter_shape([(1,), (2,)], executemany=True) == \
+        {"executemany": 2, "row": ["int"]}
+
+
+def test_slow_query_log_ranks_by_total_time_and_is_bounded():
+    log = slow_queries.SlowQueryLog(ring_size=2, max_statements=2)
+    log.record("A", 100, [])
+    log.record("B", 300, [])
+    log.record("A", 250, [])
+    assert [stats["sql"] for stats in log.top()] == ["A", "B"]
+    assert log.top()[0]["count"] == 2
+    assert log.top()[0]["mean_ms"] == 175
+    log.record("C", 10, [])
+    assert "B" not in log.statements
+    assert len(log.recent) == 2
+
+
+def run_statement(monkeypatch, duration, statement="SELECT 1", sample=1.0):
+    log = slow_queries.SlowQueryLog()
+    monkeypatch.setattr(slow_queries, "slow_query_log", log)
+    monkeypatch.setattr(slow_queries, "SLOW_QUERY_THRESHOLD_MS", 100)
+    monkeypatch.setattr(slow_queries, "SLOW_QUERY_EXPLAIN_SAMPLE_RATE", sample)
+    explain = MagicMock(return_value=[{"Plan": {"Node Type": "Seq Scan"}}])
+    monkeypatch.setattr(slow_queries, "explain_analyze", explain)
+    times = iter([10.0, 10.0 + duration / 1000])
+    monkeypatch.setattr(slow_queries.time, "perf_counter", lambda: next(times))
+    conn = MagicMock()
+    conn.info = {}
+    slow_queries.before_cursor_execute(conn, None, statement, (1,), None, False)
+    slow_queries.after_cursor_execute(conn, None, statement, (1,), None, False)
+    return log, explain
+
+
+def test_fast_statement_is_not_recorded(monkeypatch):
+    log, explain = run_statement(monkeypatch, duration=5)
+    assert not log.statements
+    explain.assert_not_called()
+
+
+def test_slow_select_is_recorded_with_sampled_plan(monkeypatch):
+    log, explain = run_statement(monkeypatch, duration=250)
+    stats = log.statements["SELECT ?"]
+    assert stats["count"] == 1
+    assert stats["plan"] == [{"Plan": {"Node Type": "Seq Scan"}}]
+    explain.assert_called_once()
+
+
+def test_slow_write_is_never_explained(monkeypatch):
+    log, explain = run_statement(monkeypatch, duration=250, statement="UPDATE employees SET name = $1")
+    assert log.statements
+    explain.assert_not_called()
+
+
+def test_slow_queries_endpoint(monkeypatch):
+    monkeypatch.setattr(auth, "ADMIN_TOKEN", "s3cret")
+    log = slow_queries.SlowQueryLog()
+    log.record("SELECT ?", 500, [])
+    monkeypatch.setattr("app.api.admin.slow_query_log", log)
+    response = TestClient(app).get("/admin/slow-queries", headers={"X-Admin-Token": "s3cret"})
+    assert response.status_code == 200
+    assert response.json()["statements"][0]["sql"] == "SELECT ?"
@@ -0,0 +1,98 @@
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.api.employees import sync_employees
+from app.db.models import Employee, User
+from app.services.sync import fetch_changes, wait_for_pending_changes
+
+mock_user = User(id=1, username="testuser", hashed_password="x", org_id=1)
+
+
+def scalar_result(value):
+    result = MagicMock()
+    result.scalar.return_value = value
+    return result
+
+
+def make_db(upserts, tombstones, pending=None):
+    upsert_result = MagicMock()
+    upsert_result.scalars.return_value.all.return_value = upserts
+    tombstone_result = MagicMock()
+    tombstone_result.all.return_value = tombstones
+    db = MagicMock()
+    db.execute = AsyncMock(side_effect=[scalar_result(pending), upsert_result, tombstone_result])
+    return db
+
+
+def employee(emp_id, change_seq):
+    return Employee(id=emp_id, org_id=1, name=f"Employee {emp_id}", department="HR",
+                    contact_info="secret", change_seq=change_seq)
+
+
+@pytest.mark.asyncio
+async def test_fetch_changes_merges_in_change_order():
+    db = make_db([employee(1, 10), employee(2, 14)], [(7, 12)])
+    upserts, deletes, next_token, has_more = await fetch_changes(db, 1, since=5, limit=10)
+    assert [emp.id for emp in upserts] == [1, 2]
+    assert deletes == [7]
+    assert next_token == 14
+    assert has_more is False
+
+
+@pytest.mark.asyncio
+async def test_fetch_changes_cuts_batch_at_limit():
+    db = make_db([employee(1, 10), employee(2, 14)], [(7, 12)])
+    upserts, deletes, next_token, has_more = await fetch_changes(db, 1, since=5, limit=2)
+    assert [emp.id for emp in upserts] == [1]
+    assert deletes == [7]
+    assert next_token == 12
+    assert has_more is True
+
+
+@pytest.mark.asyncio
+async def test_fetch_changes_without_changes_keeps_token():
+    db = make_db([], [])
+    _, _, next_token, has_more = await fetch_changes(db, 1, since=42, limit=10)
+    assert next_token == 42
+    assert has_more is False
+
+
+@pytest.mark.asyncio
+async def test_fetch_changes_holds_back_changes_open_transactions_may_commit():
+    db = make_db([employee(1, 10)], [], pending=11)
+    await fetch_changes(db, 1, since=5, limit=10)
+    upsert_sql, tombstone_sql = (str(call.args[0]) for call in db.execute.await_args_list[1:])
+    assert "employees.change_seq < :change_seq_2" in upsert_sql
+    assert "employee_tombstones.change_seq < :change_seq_2" in tombstone_sql
+
+
+@pytest.mark.asyncio
+async def test_fetch_changes_without_open_transactions_has_no_upper_bound():
+    db = make_db([employee(1, 10)], [])
+    await fetch_changes(db, 1, since=5, limit=10)
+    upsert_sql = str(db.execute.await_args_list[1].args[0])
+    assert "employees.change_seq < " not in upsert_sql
+
+
+@pytest.mark.asyncio
+async def test_wait_for_pending_changes_waits_for_older_writers():
+    # last_value 50; a writer that claimed 40 finishes, then only a newer one (51) is open
+    db = MagicMock()
+    db.execute = AsyncMock(side_effect=[scalar_result(50), scalar_result(40), scalar_result(51)])
+    with patch("app.services.sync.asyncio.sleep", AsyncMock()) as sleep:
+        await wait_for_pending_changes(db)
+    assert sleep.await_count == 1
+    assert db.execute.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_sync_endpoint_projects_org_fields():
+    db = make_db([employee(1, 10)], [(7, 12)])
+    with patch("app.api.employees.get_org_config", AsyncMock(return_value=["name", "department"])):
+        result = await sync_employees(org_id=1, since=0, limit=100, current_user=mock_user, db=db)
+        result = json.loads(result.body)
+    assert result["upserts"] == [{"id": 1, "name": "Employee 1", "department": "HR"}]
+    assert result["deletes"] == [7]
+    assert result["next_token"] == 12
+    assert result["has_more"] is False
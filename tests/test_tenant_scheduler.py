@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.middleware.tenant_scheduler import TenantScheduler, parse_weights
+
+
+def test_parse_weights():
+    assert parse_weights("1:4, 7:0.5") == {1: 4.0, 7: 0.5}
+    assert parse_weights("") == {}
+
+
+def test_org_limit_scales_with_weight():
+    scheduler = TenantScheduler(capacity=20, max_per_org=4, weights={1: 2.0, 2: 0.1})
+    assert scheduler.org_limit(1) == 8
+    assert scheduler.org_limit(2) == 1
+    assert scheduler.org_limit(3) == 4
+
+
+def test_busy_org_does_not_block_other_orgs():
+    async def scenario():
+        scheduler = TenantScheduler(capacity=4, max_per_org=2, queue_timeout=0.05, weights={})
+        await scheduler.acquire(1)
+        await scheduler.acquire(1)
+        # Org 1 is at its cap and has to wait...
+        with pytest.raises(HTTPException) as exc:
+            await scheduler.acquire(1)
+        assert exc.value.status_code == 503
+        # ...while org 2 is admitted immediately
+        await scheduler.acquire(2)
+        assert scheduler.in_flight == {1: 2, 2: 1}
+
+    asyncio.run(scenario())
+
+
+def test_freed_slot_goes_to_least_served_org():
+    async def scenario():
+        scheduler = TenantScheduler(capacity=3, max_per_org=3, queue_timeout=1, weights={})
+        for _ in range(3):
+            await scheduler.acquire(1)
+        heavy = asyncio.create_task(scheduler.acquire(1))
+        light = asyncio.create_task(scheduler.acquire(2))
+        await asyncio.sleep(0)
+        scheduler.release(1)
+        await light
+        assert scheduler.in_flight == {1: 2, 2: 1}
+        assert not heavy.done()
+        scheduler.release(2)
+        await heavy
+        assert scheduler.in_flight == {1: 3}
+
+    asyncio.run(scenario())
@@ -0,0 +1,100 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from fastapi.testclient import TestClient
+
+from app.db.queries import SEARCH_FILTERS
+from app import main
+from app.main import app
+from app.services import warmup
+
+client = TestClient(app)
+
+
+def test_readiness_not_ready_before_warmup(monkeypatch):
+    monkeypatch.setattr("app.main.warmup_state", warmup.WarmupState())
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json() == {"status": "not ready"}
+
+
+def test_readiness_ready_after_warmup(monkeypatch):
+    state = warmup.WarmupState()
+    state.ready = True
+    state.duration = 0.25
+    monkeypatch.setattr("app.main.warmup_state", state)
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+
+
+def test_warm_up_is_best_effort(monkeypatch):
+    state = warmup.WarmupState()
+    monkeypatch.setattr(warmup, "warmup_state", state)
+    session = MagicMock()
+    session.__aenter__ = AsyncMock(return_value=session)
+    session.__aexit__ = AsyncMock(return_value=None)
+    session.execute = AsyncMock(side_effect=RuntimeError("db down"))
+
+    with patch.object(warmup, "prewarm_pool", AsyncMock(side_effect=RuntimeError("db down"))), \
+            patch.object(warmup, "ping_redis", AsyncMock(side_effect=RuntimeError("redis down"))), \
+            patch.object(warmup, "AsyncSessionLocal", return_value=session):
+        asyncio.run(warmup.warm_up())
+
+    assert state.ready is True
+    assert {error["step"] for error in state.errors} == {
+        "prewarm_pool",
+        "ping_redis",
+        "most_active_orgs",
+    }
+
+
+def test_most_active_orgs_reads_headcount_summary():
+    db = MagicMock()
+    db.execute = AsyncMock(return_value=MagicMock(scalars=MagicMock(return_value=MagicMock(all=MagicMock(return_value=[3, 1])))))
+    assert asyncio.run(warmup.get_most_active_orgs(db, count=2)) == [3, 1]
+    sql = str(db.execute.call_args[0][0])
+    assert "FROM employee_headcounts" in sql
+    assert "FROM employees" not in sql
+
+
+def test_exercise_search_statements_covers_common_filters():
+    db = MagicMock()
+    db.execute = AsyncMock()
+    asyncio.run(warmup.exercise_search_statements(db, org_id=1))
+    assert db.execute.await_count == 2 * (len(SEARCH_FILTERS) + 1)
+
+
+def _run_lifespan(monkeypatch, warm_up, timeout):
+    monkeypatch.setattr("app.main.WARMUP_BEFORE_SERVING", True)
+    monkeypatch.setattr("app.main.WARMUP_TIMEOUT", timeout)
+    monkeypatch.setattr("app.main.warm_up", warm_up)
+    monkeypatch.setattr("app.main.shard_router", MagicMock(monitor_health=AsyncMock(), dispose=AsyncMock()))
+    monkeypatch.setattr("app.main.close_redis", AsyncMock())
+    monkeypatch.setattr("app.main.shutdown_logging", MagicMock())
+    events = []
+
+    async def serve():
+        async with main.lifespan(app):
+            events.append("serving")
+
+    return events, serve
+
+
+def test_lifespan_finishes_warm_up_before_serving(monkeypatch):
+    async def warm_up():
+        await asyncio.sleep(0.01)
+        events.append("warm")
+
+    events, serve = _run_lifespan(monkeypatch, warm_up, timeout=1)
+    asyncio.run(serve())
+    assert events == ["warm", "serving"]
+
+
+def test_lifespan_serves_after_warm_up_timeout(monkeypatch):
+    async def warm_up():
+        await asyncio.sleep(10)
+
+    events, serve = _run_lifespan(monkeypatch, warm_up, timeout=0.01)
+    asyncio.run(serve())
+    assert events == ["serving"]